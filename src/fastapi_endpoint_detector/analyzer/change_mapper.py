@@ -7,11 +7,16 @@ dependency analysis to determine which endpoints are affected by code changes.
 Uses mypy for type-aware, precise dependency tracking.
 """
 
+import hashlib
+import json
+import os
 import time
+from itertools import groupby
 from pathlib import Path
 from typing import Callable, Optional
 
-from fastapi_endpoint_detector.config import Config
+from fastapi_endpoint_detector import __version__
+from fastapi_endpoint_detector.config import DEFAULT_CONFIG, Config
 from fastapi_endpoint_detector.models.diff import DiffFile, ChangeType
 from fastapi_endpoint_detector.models.endpoint import Endpoint
 from fastapi_endpoint_detector.models.report import (
@@ -28,6 +33,27 @@ from fastapi_endpoint_detector.analyzer.endpoint_registry import EndpointRegistr
 # Progress callback type: (current, total, description) -> None
 ProgressCallback = Callable[[int, int, str], None]
 
+# Upper bound on progress updates emitted by a single per-item loop
+MAX_PROGRESS_UPDATES = 50
+
+
+def _progress_step(total: int) -> int:
+    """Get how many items to process between progress updates."""
+    return max(1, total // MAX_PROGRESS_UPDATES)
+
+
+def _group_consecutive_lines(sorted_lines: list[int]) -> list[list[int]]:
+    """
+    Split sorted, unique line numbers into runs of consecutive lines.
+    
+    Within a run, line - index is constant, so groupby on that key finds
+    the run boundaries without a hand-written comparison loop.
+    """
+    return [
+        [line for _, line in run]
+        for _, run in groupby(enumerate(sorted_lines), key=lambda p: p[1] - p[0])
+    ]
+
 
 class ChangeMapperError(Exception):
     """Error during change mapping."""
@@ -64,7 +90,7 @@ class ChangeMapper:
             use_cache: Whether to use cached analysis results (default True).
         """
         self.app_path = app_path.resolve()
-        self.config = config or Config()
+        self.config = config or DEFAULT_CONFIG
         self.app_variable = app_variable
         self.use_cache = use_cache
         
@@ -72,6 +98,9 @@ class ChangeMapper:
         self._extractor: Optional[FastAPIExtractor] = None
         self._registry: Optional[EndpointRegistry] = None
         self._mypy_analyzer: Optional["MypyAnalyzer"] = None
+        
+        # Source lines of changed files, keyed by (path, mtime_ns)
+        self._file_lines_cache: dict[tuple[str, int], list[str]] = {}
     
     @property
     def extractor(self) -> FastAPIExtractor:
@@ -105,17 +134,117 @@ class ChangeMapper:
             else:
                 package_path = self.app_path
             
-            self._mypy_analyzer = MypyAnalyzer(package_path)
+            self._mypy_analyzer = MypyAnalyzer(package_path, incremental=self.use_cache)
             # NOTE: We don't pre-analyze here - that's done in _preanalyze_mypy
             # with progress reporting
         return self._mypy_analyzer
     
+    @property
+    def report_cache_path(self) -> Path:
+        """Path to the cached report, stored next to the mypy analysis cache."""
+        path: Path = self.mypy_analyzer.cache_path.with_name(".endpoint_report_cache.json")
+        return path
+    
+    def _report_cache_key(self, diff_source: Path | str) -> Optional[str]:
+        """
+        Compute the cache key for a report on the given diff.
+        
+        The key covers the package version and cache format, the diff
+        content, the working directory relative diff paths are resolved
+        against, the registered endpoints, the configuration, the mypy cache
+        modification time and the stamps of every project source file, so
+        any change to the inputs of analyze_diff, including edits that leave
+        handler lines in place and upgrades that change detection logic,
+        produces a different key.
+        
+        Args:
+            diff_source: Path to diff file or diff content string.
+            
+        Returns:
+            Hex digest key, or None if the diff cannot be read.
+        """
+        from fastapi_endpoint_detector.analyzer.mypy_analyzer import (
+            CACHE_FORMAT_VERSION,
+        )
+        
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{__version__}\0{CACHE_FORMAT_VERSION}\0{Path.cwd()}\0".encode())
+        try:
+            if isinstance(diff_source, Path):
+                digest.update(str(diff_source).encode("utf-8"))
+                digest.update(diff_source.read_bytes())
+            else:
+                digest.update(diff_source.encode("utf-8"))
+        except OSError:
+            return None
+        
+        digest.update(self.registry.fingerprint().encode("utf-8"))
+        digest.update(self.config.model_dump_json().encode("utf-8"))
+        try:
+            mtime_ns = self.mypy_analyzer.cache_path.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = 0
+        digest.update(str(mtime_ns).encode("utf-8"))
+        digest.update(self.mypy_analyzer.source_fingerprint().encode("utf-8"))
+        return digest.hexdigest()
+    
+    def _load_cached_report(self, key: str) -> Optional[AnalysisReport]:
+        """Load the cached report if it was stored under the given key."""
+        try:
+            data = json.loads(self.report_cache_path.read_text(encoding="utf-8"))
+            if data.get("key") != key:
+                return None
+            return AnalysisReport.model_validate(data["report"])
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def _save_cached_report(self, key: str, report: AnalysisReport) -> None:
+        """Atomically write a report to the report cache under the given key."""
+        cache_path = self.report_cache_path
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(
+                json.dumps({"key": key, "report": report.model_dump(mode="json")}),
+                encoding="utf-8",
+            )
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+    
+    def _read_lines(self, file_path: str) -> list[str]:
+        """
+        Read the lines of a source file, reusing earlier reads.
+        
+        The modification time is part of the cache key so an edited file is
+        read again.
+        
+        Args:
+            file_path: Path to the file.
+            
+        Returns:
+            The file's lines, or an empty list if it cannot be read.
+        """
+        try:
+            mtime_ns = os.stat(file_path).st_mtime_ns
+        except OSError:
+            return []
+        
+        key = (file_path, mtime_ns)
+        lines = self._file_lines_cache.get(key)
+        if lines is None:
+            try:
+                with open(file_path, encoding="utf-8") as f:
+                    lines = f.readlines()
+            except (OSError, UnicodeDecodeError):
+                lines = []
+            self._file_lines_cache[key] = lines
+        return lines
+    
     def _check_direct_handler_change(
         self,
         endpoint: Endpoint,
         diff_file: DiffFile,
-        added_lines: list[int],
-        removed_lines: list[int],
+        changed_lines: set[int],
     ) -> Optional[AffectedEndpoint]:
         """
         Check if a diff directly modifies an endpoint's handler.
@@ -123,8 +252,7 @@ class ChangeMapper:
         Args:
             endpoint: The endpoint to check.
             diff_file: The diff file.
-            added_lines: Lines added in the diff.
-            removed_lines: Lines removed in the diff.
+            changed_lines: Lines added or removed in the diff.
             
         Returns:
             AffectedEndpoint if directly affected, None otherwise.
@@ -133,10 +261,9 @@ class ChangeMapper:
         handler_end = handler.end_line_number or handler.line_number + 50
         
         # Check if any changed lines overlap with handler
-        all_changed = set(added_lines) | set(removed_lines)
         handler_lines = set(range(handler.line_number, handler_end + 1))
         
-        if all_changed & handler_lines:
+        if changed_lines & handler_lines:
             return AffectedEndpoint(
                 endpoint=endpoint,
                 confidence=ConfidenceLevel.HIGH,
@@ -151,8 +278,8 @@ class ChangeMapper:
         self,
         endpoint: Endpoint,
         diff_file: DiffFile,
-        added_lines: list[int],
-        removed_lines: list[int],
+        changed_lines: set[int],
+        window_lines: set[int],
     ) -> Optional[AffectedEndpoint]:
         """
         Check if an endpoint's dependencies (via mypy analysis) intersect with changes.
@@ -162,8 +289,8 @@ class ChangeMapper:
         Args:
             endpoint: The endpoint to check.
             diff_file: The diff file.
-            added_lines: Lines added in the diff.
-            removed_lines: Lines removed in the diff.
+            changed_lines: Lines added or removed in the diff.
+            window_lines: changed_lines plus surrounding context lines.
             
         Returns:
             AffectedEndpoint if dependencies intersect, None otherwise.
@@ -179,19 +306,13 @@ class ChangeMapper:
         if not deps.references_file(file_path):
             return None
         
-        # Check for line-level intersection
-        changed_lines = set(added_lines) | set(removed_lines)
-        
         # Also check context lines (for added lines that don't exist yet)
-        context_lines = set()
-        for line in changed_lines:
-            context_lines.update(range(max(1, line - 3), line + 4))
-        
-        overlap = deps.references_lines(file_path, changed_lines | context_lines)
+        overlap = deps.references_lines(file_path, window_lines)
         
         if overlap:
-            # Filter to show most relevant lines
-            direct_overlap = deps.references_lines(file_path, changed_lines)
+            # Filter to show most relevant lines (changed_lines is a subset of
+            # the lines already intersected, so no second lookup is needed)
+            direct_overlap = overlap & changed_lines
             display_lines = direct_overlap if direct_overlap else overlap
             
             # Get call stack for traceback-style output
@@ -212,32 +333,12 @@ class ChangeMapper:
                     # Sort the changed lines
                     sorted_lines = sorted(display_lines)
                     
-                    # Read the file once for all lines
-                    lines_list = []
-                    try:
-                        file_path_obj = Path(file_path)
-                        if file_path_obj.exists():
-                            with open(file_path_obj, encoding="utf-8") as f:
-                                lines_list = f.readlines()
-                    except (OSError, UnicodeDecodeError):
-                        pass
+                    # Read the file once for all endpoints
+                    lines_list = self._read_lines(file_path)
                     
                     # Group consecutive lines together
                     if sorted_lines:  # Safety check
-                        line_groups = []
-                        current_group = [sorted_lines[0]]
-                        
-                        for i in range(1, len(sorted_lines)):
-                            if sorted_lines[i] == sorted_lines[i-1] + 1:
-                                # Consecutive line, add to current group
-                                current_group.append(sorted_lines[i])
-                            else:
-                                # Non-consecutive, start a new group
-                                line_groups.append(current_group)
-                                current_group = [sorted_lines[i]]
-                        
-                        # Don't forget the last group
-                        line_groups.append(current_group)
+                        line_groups = _group_consecutive_lines(sorted_lines)
                         
                         # Add a frame for each group of lines
                         for group in line_groups:
@@ -245,12 +346,9 @@ class ChangeMapper:
                             last_line = group[-1]
                             
                             # Try to get the function name from symbol references
-                            function_name = "module"
-                            for sym_ref in deps.referenced_symbols:
-                                if (sym_ref.file_path == file_path and 
-                                    sym_ref.contains_line(first_line)):
-                                    function_name = sym_ref.symbol_name
-                                    break
+                            function_name = (
+                                deps.symbol_name_at_line(file_path, first_line) or "module"
+                            )
                             
                             # Try to get code context from the file
                             # For ranges, show all lines in the group
@@ -301,34 +399,40 @@ class ChangeMapper:
             List of affected endpoints from this file.
         """
         affected: list[AffectedEndpoint] = []
-        seen_endpoints: set[str] = set()
         
-        # Get changed lines
+        # Get changed lines once for both checks
         added_lines, removed_lines = DiffParser.get_changed_line_numbers(diff_file)
+        changed_lines = set(added_lines) | set(removed_lines)
         
-        # Find endpoints in the changed file
-        file_endpoints = self.registry.get_by_file(diff_file.path)
-        
-        # Check for direct handler changes
-        for endpoint in file_endpoints:
-            result = self._check_direct_handler_change(
-                endpoint, diff_file, added_lines, removed_lines
-            )
-            if result:
-                affected.append(result)
-                seen_endpoints.add(endpoint.identifier)
+        # Endpoints defined in the changed file can be hit directly
+        file_endpoint_ids = {
+            endpoint.identifier for endpoint in self.registry.get_by_file(diff_file.path)
+        }
         
-        # Use mypy for type-aware dependency analysis
-        for endpoint in self.registry:
-            if endpoint.identifier in seen_endpoints:
-                continue
-            
-            result = self._check_mypy_dependency(
-                endpoint, diff_file, added_lines, removed_lines
-            )
+        # Only endpoints whose analysis references the file can depend on it
+        candidate_ids = self.mypy_analyzer.get_endpoints_referencing_file(str(diff_file.path))
+        
+        # Changed lines plus context (for added lines that don't exist yet),
+        # built once and intersected with every candidate's references
+        window_lines = set(changed_lines)
+        if candidate_ids:
+            for line in changed_lines:
+                window_lines.update(range(max(1, line - 3), line + 4))
+        
+        # Single pass: direct handler check for endpoints in the changed file,
+        # falling back to mypy type-aware dependency analysis
+        for endpoint, endpoint_id in self.registry.iter_with_ids():
+            result = None
+            if endpoint_id in file_endpoint_ids:
+                result = self._check_direct_handler_change(
+                    endpoint, diff_file, changed_lines
+                )
+            if result is None and endpoint_id in candidate_ids:
+                result = self._check_mypy_dependency(
+                    endpoint, diff_file, changed_lines, window_lines
+                )
             if result:
                 affected.append(result)
-                seen_endpoints.add(endpoint.identifier)
         
         return affected
     
@@ -348,7 +452,7 @@ class ChangeMapper:
         Returns:
             AnalysisReport with all affected endpoints.
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         errors: list[str] = []
         warnings: list[str] = []
         
@@ -377,22 +481,37 @@ class ChangeMapper:
         report_progress(5, 100, "Extracting endpoints...")
         total_endpoints = len(self.registry)
         
-        # Pre-analyze endpoints with mypy
-        report_progress(10, 100, f"Analyzing {total_endpoints} endpoints (mypy)...")
-        self._preanalyze_mypy(progress_callback)
+        # Return the cached report if none of the inputs changed
+        if self.use_cache and not errors:
+            report_key = self._report_cache_key(diff_source)
+            cached_report = self._load_cached_report(report_key) if report_key else None
+            if cached_report is not None:
+                report_progress(100, 100, "Loaded cached report")
+                return cached_report.model_copy(
+                    update={"analysis_duration_ms": (time.perf_counter_ns() - start_ns) / 1e6},
+                )
+        
+        # Pre-analyze endpoints with mypy - skipped entirely when the diff has
+        # no Python changes, since nothing could map back to an endpoint
+        if python_files:
+            report_progress(10, 100, f"Analyzing {total_endpoints} endpoints (mypy)...")
+            self._preanalyze_mypy(progress_callback)
         
         # Analyze each Python file
         report_progress(70, 100, f"Checking {len(python_files)} changed files...")
         all_affected: list[AffectedEndpoint] = []
         seen_endpoints: set[str] = set()
         
+        total_files = len(python_files)
+        step = _progress_step(total_files)
         for i, diff_file in enumerate(python_files):
             try:
-                report_progress(
-                    70 + int(20 * (i + 1) / max(len(python_files), 1)),
-                    100,
-                    f"Analyzing {diff_file.path.name}..."
-                )
+                if i % step == 0 or i == total_files - 1:
+                    report_progress(
+                        70 + int(20 * (i + 1) / total_files),
+                        100,
+                        f"Analyzing {diff_file.path.name}..."
+                    )
                 file_affected = self._analyze_diff_file(diff_file)
                 for ae in file_affected:
                     if ae.endpoint.identifier not in seen_endpoints:
@@ -416,10 +535,10 @@ class ChangeMapper:
         ]
         
         # Calculate duration
-        duration_ms = (time.time() - start_time) * 1000
+        duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
         report_progress(100, 100, "Complete!")
         
-        return AnalysisReport(
+        report = AnalysisReport(
             app_path=str(self.app_path),
             diff_source=diff_source_str,
             total_endpoints=len(self.registry),
@@ -430,14 +549,22 @@ class ChangeMapper:
             errors=errors,
             warnings=warnings,
         )
+        
+        # Key is recomputed because pre-analysis may have rewritten the mypy cache
+        if self.use_cache and not errors and not warnings:
+            report_key = self._report_cache_key(diff_source)
+            if report_key:
+                self._save_cached_report(report_key, report)
+        
+        return report
     
     def _preanalyze_mypy(
         self,
         progress_callback: Optional[ProgressCallback] = None,
     ) -> None:
         """Pre-analyze all endpoints with mypy."""
-        endpoints = self.registry.get_all()
-        total = len(endpoints)
+        endpoints = self.registry.iter_with_ids()
+        total = len(self.registry)
         
         # Try to load from cache first
         if self.use_cache and self.mypy_analyzer.cache_path.exists():
@@ -447,8 +574,8 @@ class ChangeMapper:
                 self.mypy_analyzer._load_cache()
                 # Check if all endpoints are cached
                 all_cached = all(
-                    ep.identifier in self.mypy_analyzer._endpoint_deps
-                    for ep in endpoints
+                    endpoint_id in self.mypy_analyzer._endpoint_deps
+                    for _, endpoint_id in endpoints
                 )
                 if all_cached:
                     if progress_callback:
@@ -458,14 +585,15 @@ class ChangeMapper:
                 pass
         
         # Analyze uncached endpoints
-        for i, endpoint in enumerate(endpoints):
-            if progress_callback:
+        step = _progress_step(total)
+        for i, (endpoint, endpoint_id) in enumerate(endpoints):
+            if progress_callback and (i % step == 0 or i == total - 1):
                 progress_callback(
                     10 + int(55 * (i + 1) / max(total, 1)),
                     100,
                     f"Analyzing endpoint {i + 1}/{total}: {endpoint.path}"
                 )
-            if endpoint.identifier not in self.mypy_analyzer._endpoint_deps:
+            if endpoint_id not in self.mypy_analyzer._endpoint_deps:
                 self.mypy_analyzer.analyze_endpoint(endpoint)
         
         # Save cache after analysis
@@ -477,17 +605,6 @@ class ChangeMapper:
         return self.registry.get_all()
     
     def clear_cache(self) -> None:
-        """Clear cached analysis results for mypy."""
-        if self._mypy_analyzer is not None:
-            self._mypy_analyzer.clear_cache()
-        else:
-            # Initialize and clear the cache file even if analyzer not loaded
-            from fastapi_endpoint_detector.analyzer.mypy_analyzer import (
-                MypyAnalyzer,
-            )
-            if self.app_path.is_file():
-                package_path = self.app_path.parent
-            else:
-                package_path = self.app_path
-            temp_analyzer = MypyAnalyzer(package_path)
-            temp_analyzer.clear_cache()
+        """Clear cached analysis results for mypy and the cached report."""
+        self.report_cache_path.unlink(missing_ok=True)
+        self.mypy_analyzer.clear_cache()
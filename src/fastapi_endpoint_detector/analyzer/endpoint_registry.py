@@ -2,11 +2,16 @@
 Endpoint registry for storing and querying endpoints.
 """
 
+import hashlib
+import sys
+from bisect import bisect_right
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import Any, Iterable, Iterator, Mapping, Optional, TypeVar
 
 from fastapi_endpoint_detector.models.endpoint import Endpoint, EndpointMethod
 
+K = TypeVar("K")
+
 
 class EndpointRegistry:
     """
@@ -19,8 +24,16 @@ class EndpointRegistry:
         """Initialize an empty registry."""
         self._endpoints: list[Endpoint] = []
         self._by_path: dict[str, list[Endpoint]] = {}
+        self._by_identifier: dict[str, list[Endpoint]] = {}
         self._by_file: dict[Path, list[Endpoint]] = {}
+        self._files_by_name: dict[str, list[Path]] = {}
+        self._line_index: dict[Path, tuple[list[int], list[tuple[int, int, int, Endpoint]]]] = {}
         self._by_module: dict[str, list[Endpoint]] = {}
+        self._by_method: dict[EndpointMethod, list[Endpoint]] = {}
+        self._by_tag: dict[str, list[Endpoint]] = {}
+        self._by_dependency: dict[str, list[Endpoint]] = {}
+        self._with_ids: Optional[tuple[tuple[Endpoint, str], ...]] = None
+        self._key_sets: dict[str, frozenset[Any]] = {}
     
     def register(self, endpoint: Endpoint) -> None:
         """
@@ -30,6 +43,11 @@ class EndpointRegistry:
             endpoint: The endpoint to register.
         """
         self._endpoints.append(endpoint)
+        self._with_ids = None
+        self._key_sets.clear()
+        
+        # Index by identifier (Endpoint holds lists, so it is not hashable)
+        self._by_identifier.setdefault(endpoint.identifier, []).append(endpoint)
         
         # Index by path
         if endpoint.path not in self._by_path:
@@ -40,13 +58,25 @@ class EndpointRegistry:
         file_path = endpoint.handler.file_path
         if file_path not in self._by_file:
             self._by_file[file_path] = []
+            self._files_by_name.setdefault(file_path.name, []).append(file_path)
         self._by_file[file_path].append(endpoint)
+        self._line_index.pop(file_path, None)
         
         # Index by module
-        module = endpoint.handler.module
+        # Module names repeat across many endpoints; interning makes the
+        # repeated dict lookups hit on identity
+        module = sys.intern(endpoint.handler.module)
         if module not in self._by_module:
             self._by_module[module] = []
         self._by_module[module].append(endpoint)
+        
+        # Index by method, tag and dependency (each endpoint listed once per key)
+        for method in dict.fromkeys(endpoint.methods):
+            self._by_method.setdefault(method, []).append(endpoint)
+        for tag in dict.fromkeys(endpoint.tags):
+            self._by_tag.setdefault(tag, []).append(endpoint)
+        for dependency in dict.fromkeys(endpoint.dependencies):
+            self._by_dependency.setdefault(dependency, []).append(endpoint)
     
     def register_many(self, endpoints: list[Endpoint]) -> None:
         """
@@ -62,6 +92,20 @@ class EndpointRegistry:
         """Get all registered endpoints."""
         return list(self._endpoints)
     
+    def iter_with_ids(self) -> Iterable[tuple[Endpoint, str]]:
+        """
+        Get all registered endpoints paired with their identifiers.
+        
+        The pairs are computed once and reused until the next registration,
+        so hot loops avoid recomputing Endpoint.identifier.
+        
+        Returns:
+            Tuple of (endpoint, identifier) pairs in registration order.
+        """
+        if self._with_ids is None:
+            self._with_ids = tuple((e, e.identifier) for e in self._endpoints)
+        return self._with_ids
+    
     def get_by_path(self, path: str) -> list[Endpoint]:
         """
         Get endpoints by URL path.
@@ -84,6 +128,21 @@ class EndpointRegistry:
         Returns:
             List of endpoints defined in that file.
         """
+        registered_path = self._find_registered_file(file_path)
+        if registered_path is None:
+            return []
+        return self._by_file[registered_path]
+    
+    def _find_registered_file(self, file_path: Path | str) -> Optional[Path]:
+        """
+        Find the registered file path that a (possibly relative) path names.
+        
+        Args:
+            file_path: Path to the file (can be relative or absolute).
+            
+        Returns:
+            The matching key of the file index, or None.
+        """
         if isinstance(file_path, str):
             file_path = Path(file_path)
         
@@ -91,26 +150,27 @@ class EndpointRegistry:
         try:
             resolved = file_path.resolve()
             if resolved in self._by_file:
-                return self._by_file[resolved]
+                return resolved
         except OSError:
             pass
         
         # Try exact match
         if file_path in self._by_file:
-            return self._by_file[file_path]
+            return file_path
         
-        # Try matching by filename (for relative paths from diffs)
+        # Try matching by filename (for relative paths from diffs), only
+        # among registered files with the same name
         file_str = str(file_path)
-        for registered_path, endpoints in self._by_file.items():
+        for registered_path in self._files_by_name.get(file_path.name, ()):
             registered_str = str(registered_path)
             # Check if the diff path is a suffix of registered path
             if registered_str.endswith(file_str) or registered_str.endswith(file_str.lstrip("./")):
-                return endpoints
+                return registered_path
             # Or check by filename match if diff path contains subdirs
-            if file_path.name == registered_path.name and file_str in registered_str:
-                return endpoints
+            if file_str in registered_str:
+                return registered_path
         
-        return []
+        return None
     
     def get_by_module(self, module: str) -> list[Endpoint]:
         """
@@ -134,7 +194,7 @@ class EndpointRegistry:
         Returns:
             List of endpoints supporting that method.
         """
-        return [e for e in self._endpoints if method in e.methods]
+        return self._by_method.get(method, [])
     
     def get_by_tag(self, tag: str) -> list[Endpoint]:
         """
@@ -146,7 +206,7 @@ class EndpointRegistry:
         Returns:
             List of endpoints with that tag.
         """
-        return [e for e in self._endpoints if tag in e.tags]
+        return self._by_tag.get(tag, [])
     
     def get_by_line_range(
         self, 
@@ -165,18 +225,37 @@ class EndpointRegistry:
         Returns:
             List of endpoints whose handlers are in the line range.
         """
-        file_endpoints = self.get_by_file(file_path)
-        overlapping: list[Endpoint] = []
+        registered_path = self._find_registered_file(file_path)
+        if registered_path is None:
+            return []
         
-        for endpoint in file_endpoints:
-            handler = endpoint.handler
-            handler_end = handler.end_line_number or handler.line_number
-            
-            # Check for overlap
-            if handler.line_number <= end_line and handler_end >= start_line:
-                overlapping.append(endpoint)
+        # Handlers sorted by start line, built once per file until it changes
+        if registered_path not in self._line_index:
+            entries = sorted(
+                (
+                    (
+                        endpoint.handler.line_number,
+                        endpoint.handler.end_line_number or endpoint.handler.line_number,
+                        position,
+                        endpoint,
+                    )
+                    for position, endpoint in enumerate(self._by_file[registered_path])
+                ),
+                key=lambda entry: entry[0],
+            )
+            self._line_index[registered_path] = ([entry[0] for entry in entries], entries)
+        starts, entries = self._line_index[registered_path]
         
-        return overlapping
+        # Only handlers starting at or before end_line can overlap
+        overlapping = [
+            (position, endpoint)
+            for _, handler_end, position, endpoint in entries[:bisect_right(starts, end_line)]
+            if handler_end >= start_line
+        ]
+        
+        # Keep registration order
+        overlapping.sort(key=lambda hit: hit[0])
+        return [endpoint for _, endpoint in overlapping]
     
     def find_endpoints_using_dependency(self, dependency_name: str) -> list[Endpoint]:
         """
@@ -188,10 +267,22 @@ class EndpointRegistry:
         Returns:
             List of endpoints using that dependency.
         """
-        return [
-            e for e in self._endpoints 
-            if dependency_name in e.dependencies
-        ]
+        return self._by_dependency.get(dependency_name, [])
+    
+    def fingerprint(self) -> str:
+        """
+        Get a content hash of all registered endpoints.
+        
+        Two registries holding the same endpoints in the same order share
+        a fingerprint, which makes it usable as part of a cache key.
+        
+        Returns:
+            Hex digest identifying the registered endpoints.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for endpoint in self._endpoints:
+            digest.update(endpoint.model_dump_json().encode("utf-8"))
+        return digest.hexdigest()
     
     def __len__(self) -> int:
         """Return the number of registered endpoints."""
@@ -203,19 +294,26 @@ class EndpointRegistry:
     
     def __contains__(self, endpoint: Endpoint) -> bool:
         """Check if an endpoint is registered."""
-        return endpoint in self._endpoints
+        return endpoint in self._by_identifier.get(endpoint.identifier, ())
+    
+    def _key_set(self, name: str, index: Mapping[K, Any]) -> frozenset[K]:
+        """Get the keys of an index as a frozenset, shared until the next registration."""
+        keys = self._key_sets.get(name)
+        if keys is None:
+            keys = self._key_sets[name] = frozenset(index)
+        return keys
     
     @property
-    def files(self) -> set[Path]:
+    def files(self) -> frozenset[Path]:
         """Get all files containing endpoints."""
-        return set(self._by_file.keys())
+        return self._key_set("files", self._by_file)
     
     @property
-    def modules(self) -> set[str]:
+    def modules(self) -> frozenset[str]:
         """Get all modules containing endpoints."""
-        return set(self._by_module.keys())
+        return self._key_set("modules", self._by_module)
     
     @property
-    def paths(self) -> set[str]:
+    def paths(self) -> frozenset[str]:
         """Get all unique endpoint paths."""
-        return set(self._by_path.keys())
+        return self._key_set("paths", self._by_path)
@@ -11,29 +11,236 @@ using mypy's internal data structures to track file/line references.
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import shutil
 import sys
-from collections.abc import Callable
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from dataclasses import dataclass, field
+from itertools import accumulate
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, cast
 
 from fastapi_endpoint_detector.models.endpoint import Endpoint
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+# Node classes are imported once here rather than on every traced function;
+# when mypy is missing, MypyAnalyzer refuses to build before any are used
+try:
+    from mypy.nodes import (
+        AssertStmt, AssignmentStmt, AwaitExpr, Block, CallExpr, ClassDef,
+        ComparisonExpr, ConditionalExpr, Decorator, DictExpr,
+        DictionaryComprehension, ExpressionStmt, ForStmt, FuncDef,
+        GeneratorExpr, IfStmt, IndexExpr, LambdaExpr, ListComprehension,
+        ListExpr, MemberExpr, NameExpr, OpExpr, OverloadedFuncDef, RaiseStmt,
+        ReturnStmt, SetComprehension, SetExpr, TryStmt, TupleExpr, UnaryExpr,
+        WhileStmt, WithStmt, YieldExpr, YieldFromExpr,
+    )
+    from mypy.types import Instance
+    _MYPY_NODES_AVAILABLE = True
+except ImportError:  # pragma: no cover - reported by MypyAnalyzer
+    _MYPY_NODES_AVAILABLE = False
+
 if TYPE_CHECKING:
     from mypy.build import BuildResult
     from mypy.nodes import MypyFile
 
+    # Per-file symbol index sorted by start line: start lines, end lines,
+    # the running maximum of the end lines, and symbol names
+    SymbolIndex = tuple[array[int], array[int], array[int], list[str]]
+
 # Type alias for line-level progress callback (file_path, line_number, symbol_name)
 LineProgressCallback = Callable[[str, int, str], None]
 
+# Resolved call target: the file path and module name of the definition, its
+# function node (None when only the module was found) and its line range
+TraceTarget = tuple[str, str, Any, int, int]
+
+# Bumped whenever the on-disk cache layout changes; other versions are ignored
+CACHE_FORMAT_VERSION = 5
+
+
+PathKey = tuple[int, int] | str
+
+
+def _normalize_path(file_path: str) -> tuple[PathKey, str]:
+    """
+    Get the identity key and file name for a path string.
+    
+    The key is the (device, inode) pair of an existing file, which takes a
+    single stat instead of the per-component walk of resolving symlinks and
+    also matches hard links. Paths that cannot be stat'ed fall back to their
+    case-normalized absolute path. The file name is case-normalized so
+    lookups match on case-insensitive filesystems. Not memoized across
+    analyses, since files may be created or deleted and inodes reused in
+    between; callers keep their keys for as long as their own indexes live.
+    """
+    normcase = os.path.normcase
+    name = normcase(os.path.basename(file_path))
+    try:
+        st = os.stat(file_path)
+    except (OSError, ValueError):
+        return normcase(os.path.abspath(file_path)), name
+    return (st.st_dev, st.st_ino), name
+
+
+def _dumps_line(obj: Any) -> bytes:
+    """Serialize an object as one compact JSON Lines record."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _file_stamp(file_path: str) -> list[int] | None:
+    """Get the [mtime_ns, size] stamp used to detect edits to a file, or None if missing."""
+    try:
+        st = os.stat(file_path)
+    except (OSError, ValueError):
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _encode_line_runs(lines: Iterable[int]) -> list[int]:
+    """Encode line numbers as a flat [start, length, start, length, ...] run list."""
+    runs: list[int] = []
+    for line in sorted(lines):
+        if runs and runs[-2] + runs[-1] == line:
+            runs[-1] += 1
+        else:
+            runs.extend((line, 1))
+    return runs
+
+
+def _decode_line_runs(runs: list[int]) -> array[int]:
+    """
+    Decode a flat run list produced by _encode_line_runs.
+    
+    Runs are stored in ascending order, so the result is already the sorted
+    array that EndpointDependencies.freeze() would produce.
+    """
+    lines: array[int] = array("i")
+    for i in range(0, len(runs), 2):
+        start = runs[i]
+        lines.extend(range(start, start + runs[i + 1]))
+    return lines
+
+
+def _intersect_sorted(sorted_lines: array[int], lines: set[int]) -> set[int]:
+    """
+    Intersect a sorted line array with a set.
+    
+    Iterates whichever side is smaller: a large query set is probed with
+    the array's lines, a small one is bisected into the array after
+    rejecting out-of-range lines up front.
+    """
+    if not sorted_lines or not lines:
+        return set()
+    
+    if len(lines) > len(sorted_lines):
+        return lines.intersection(sorted_lines)
+    
+    first, last = sorted_lines[0], sorted_lines[-1]
+    result: set[int] = set()
+    for line in lines:
+        if first <= line <= last and sorted_lines[bisect_left(sorted_lines, line)] == line:
+            result.add(line)
+    return result
+
+
+ChildGetter = Callable[[Any], Sequence[Any]]
+
+
+def _build_child_getters() -> dict[type, ChildGetter | None]:
+    """Build the dispatch table used to walk the children of mypy AST nodes."""
+    def expr_child(n: Any) -> tuple[Any, ...]:
+        return (n.expr,)
+    
+    def items(n: Any) -> list[Any]:
+        return cast("list[Any]", n.items)
+    
+    def generator_children(n: Any) -> list[Any]:
+        children = [n.left_expr]
+        children.extend(cond for conds in n.condlists for cond in conds)
+        children.extend(n.sequences)
+        return children
+    
+    def dict_comprehension_children(n: Any) -> list[Any]:
+        children = [n.key, n.value]
+        children.extend(cond for conds in n.condlists for cond in conds)
+        children.extend(n.sequences)
+        return children
+    
+    return {
+        Block: lambda n: n.body,
+        ExpressionStmt: expr_child,
+        AssignmentStmt: lambda n: (*n.lvalues, n.rvalue),
+        ReturnStmt: expr_child,
+        IfStmt: lambda n: (*n.expr, *n.body, n.else_body),
+        WhileStmt: lambda n: (n.expr, n.body),
+        ForStmt: lambda n: (n.expr, n.body),
+        WithStmt: lambda n: (*n.expr, n.body),
+        TryStmt: lambda n: (n.body, *n.handlers, n.else_body, n.finally_body),
+        RaiseStmt: expr_child,
+        AssertStmt: expr_child,
+        AwaitExpr: expr_child,
+        IndexExpr: lambda n: (n.base, n.index),
+        OpExpr: lambda n: (n.left, n.right),
+        ComparisonExpr: lambda n: n.operands,
+        UnaryExpr: expr_child,
+        ConditionalExpr: lambda n: (n.cond, n.if_expr, n.else_expr),
+        ListExpr: items,
+        TupleExpr: items,
+        SetExpr: items,
+        DictExpr: lambda n: [node for pair in n.items for node in pair],
+        GeneratorExpr: generator_children,
+        ListComprehension: lambda n: (n.generator,),
+        SetComprehension: lambda n: (n.generator,),
+        DictionaryComprehension: dict_comprehension_children,
+        LambdaExpr: lambda n: (n.body,),
+        YieldExpr: expr_child,
+        YieldFromExpr: expr_child,
+    }
+
+
+# mypy node type -> getter for the child nodes to walk (None: nothing to walk)
+_CHILD_GETTERS: dict[type, ChildGetter | None] = (
+    _build_child_getters() if _MYPY_NODES_AVAILABLE else {}
+)
+
+
+def _child_getter(node_type: type) -> ChildGetter | None:
+    """
+    Get the child getter for a mypy node type.
+    
+    Types missing from the table fall back to their nearest registered base
+    class, and the answer is cached so every node costs one dict lookup.
+    """
+    try:
+        return _CHILD_GETTERS[node_type]
+    except KeyError:
+        pass
+    
+    getter = next(
+        (_CHILD_GETTERS[base] for base in node_type.__mro__[1:] if _CHILD_GETTERS.get(base)),
+        None,
+    )
+    _CHILD_GETTERS[node_type] = getter
+    return getter
+
 
 class MypyAnalyzerError(Exception):
     """Error during mypy analysis."""
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class CallFrame:
     """A single frame in the call stack."""
     file_path: str
@@ -42,7 +249,7 @@ class CallFrame:
     code_context: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class SymbolReference:
     """A reference to a specific symbol (function/method/class) with its line range."""
     file_path: str
@@ -55,95 +262,192 @@ class SymbolReference:
         return self.start_line <= line <= self.end_line
 
 
-@dataclass
+@dataclass(slots=True)
 class EndpointDependencies:
     """Dependencies for a single endpoint determined by mypy."""
     
     endpoint_id: str
     methods: list[str]
     path: str
-    referenced_files: dict[str, set[int]] = field(default_factory=dict)
-    """Mapping of file path -> set of referenced line numbers."""
+    referenced_files: dict[str, set[int] | array[int]] = field(default_factory=dict)
+    """Mapping of file path -> referenced line numbers (a sorted array once frozen)."""
     referenced_symbols: list[SymbolReference] = field(default_factory=list)
     """List of symbol references with their file paths and line ranges."""
     call_stacks: dict[str, list[CallFrame]] = field(default_factory=dict)
     """Mapping of file path -> call stack showing how handler reaches that file."""
+    _symbols_by_file: dict[str, SymbolIndex] | None = field(
+        default=None, init=False, repr=False, compare=False,
+    )
+    """Lazily built per-file symbol index over referenced_symbols."""
+    _path_index: tuple[dict[PathKey, str], dict[str, list[str]]] | None = field(
+        default=None, init=False, repr=False, compare=False,
+    )
+    """Lazily built (path key -> key, file name -> keys) index over referenced_files."""
+    _indexed_file_count: int = field(default=0, init=False, repr=False, compare=False)
+    _query_keys: dict[str, tuple[PathKey, str]] = field(
+        default_factory=dict, init=False, repr=False, compare=False,
+    )
+    """Normalized (path key, file name) of the paths queried against this endpoint."""
+    
+    def _mutable_lines(self, file_path: str) -> set[int]:
+        """Get the referenced line set of a file, thawing a frozen array if needed."""
+        lines = self.referenced_files.get(file_path)
+        if isinstance(lines, set):
+            return lines
+        thawed = set(lines) if lines is not None else set()
+        self.referenced_files[file_path] = thawed
+        return thawed
+    
+    def freeze(self) -> None:
+        """
+        Compact the referenced line sets into sorted arrays.
+        
+        Called once analysis of the endpoint is done; the arrays use a few
+        bytes per line instead of a set entry and keep lookups logarithmic.
+        Adding references afterwards converts the affected file back to a set.
+        """
+        for file_path, lines in self.referenced_files.items():
+            if not isinstance(lines, array):
+                self.referenced_files[file_path] = array("i", sorted(lines))
     
     def add_reference(self, file_path: str, line: int, symbol_name: str = "") -> None:
         """Add a line reference to dependencies."""
-        if file_path not in self.referenced_files:
-            self.referenced_files[file_path] = set()
-        self.referenced_files[file_path].add(line)
+        self._mutable_lines(file_path).add(line)
     
     def add_symbol_reference(self, file_path: str, symbol_name: str, start_line: int, end_line: int) -> None:
         """Add a symbol reference and its line range to dependencies."""
         ref = SymbolReference(file_path, symbol_name, start_line, end_line)
         self.referenced_symbols.append(ref)
+        self._symbols_by_file = None
         
-        if file_path not in self.referenced_files:
-            self.referenced_files[file_path] = set()
-        self.referenced_files[file_path].update(range(start_line, end_line + 1))
+        self._mutable_lines(file_path).update(range(start_line, end_line + 1))
     
-    def references_symbol_at_line(self, file_path: str, line: int) -> SymbolReference | None:
-        """Check if any referenced symbol contains the given line."""
-        file_path_resolved = str(Path(file_path).resolve())
-        file_name = Path(file_path).name
+    def _build_symbol_index(self) -> dict[str, SymbolIndex]:
+        """
+        Build the per-file structure-of-arrays index over referenced symbols.
+        
+        Start and end lines are packed into int arrays so scans over a file's
+        symbols touch contiguous machine integers rather than objects. The
+        running maximum of the end lines lets lookups stop as soon as no
+        earlier symbol can reach the line.
+        """
+        grouped: dict[str, list[SymbolReference]] = {}
         for ref in self.referenced_symbols:
-            ref_resolved = str(Path(ref.file_path).resolve())
-            ref_name = Path(ref.file_path).name
-            # Match by resolved path, ending, or filename
-            if (ref_resolved == file_path_resolved or
-                ref.file_path.endswith(str(file_path)) or 
-                file_path.endswith(ref.file_path) or
-                ref_name == file_name):
-                if ref.contains_line(line):
-                    return ref
+            grouped.setdefault(ref.file_path, []).append(ref)
+        
+        index: dict[str, SymbolIndex] = {}
+        for file_path, refs in grouped.items():
+            # Stable sort keeps insertion order among symbols with the same start
+            refs.sort(key=lambda r: r.start_line)
+            ends = array("i", [r.end_line for r in refs])
+            index[file_path] = (
+                array("i", [r.start_line for r in refs]),
+                ends,
+                array("i", accumulate(ends, max)),
+                [r.symbol_name for r in refs],
+            )
+        return index
+    
+    def _symbol_at_line(self, file_path: str, line: int) -> SymbolReference | None:
+        """
+        Get the innermost referenced symbol in file_path containing a line.
+        
+        File paths are matched exactly. Candidates are located by bisecting
+        the sorted start lines and walked back towards earlier starts; among
+        the symbols containing the line, the one with the latest start wins.
+        The walk stops once the running maximum of the end lines falls below
+        the line, so lines outside every symbol cost a single bisect. Lines
+        inside a symbol still visit every symbol starting between it and the
+        line, e.g. the sibling methods above a line in a class body.
+        """
+        if self._symbols_by_file is None:
+            self._symbols_by_file = self._build_symbol_index()
+        
+        arrays = self._symbols_by_file.get(file_path)
+        if arrays is None:
+            return None
+        
+        starts, ends, max_ends, names = arrays
+        i = bisect_right(starts, line) - 1
+        while i >= 0 and max_ends[i] >= line:
+            if ends[i] >= line:
+                return SymbolReference(file_path, names[i], starts[i], ends[i])
+            i -= 1
         return None
     
-    def references_file(self, file_path: str) -> bool:
-        """Check if this endpoint references a file."""
-        file_path_resolved = str(Path(file_path).resolve())
-        file_name = Path(file_path).name
+    def symbol_name_at_line(self, file_path: str, line: int) -> str | None:
+        """Get the name of the innermost symbol in file_path containing a line."""
+        ref = self._symbol_at_line(file_path, line)
+        return ref.symbol_name if ref is not None else None
+    
+    def _path_lookup(self) -> tuple[dict[PathKey, str], dict[str, list[str]]]:
+        """
+        Get the (path key -> path, file name -> paths) index over referenced_files.
         
-        for ref_path in self.referenced_files:
-            ref_resolved = str(Path(ref_path).resolve())
-            ref_name = Path(ref_path).name
-            if (ref_resolved == file_path_resolved or
-                ref_path.endswith(str(file_path)) or
-                file_path.endswith(ref_path) or
-                ref_name == file_name):
-                return True
+        The index is rebuilt whenever new files have been referenced.
+        """
+        if self._path_index is None or self._indexed_file_count != len(self.referenced_files):
+            by_key: dict[PathKey, str] = {}
+            by_name: dict[str, list[str]] = {}
+            for ref_path in self.referenced_files:
+                key, name = _normalize_path(ref_path)
+                by_key.setdefault(key, ref_path)
+                by_name.setdefault(name, []).append(ref_path)
+            self._path_index = (by_key, by_name)
+            self._indexed_file_count = len(self.referenced_files)
+        return self._path_index
+    
+    def _matching_paths(self, file_path: str) -> list[str]:
+        """
+        Get the referenced file paths that name the same file as file_path.
         
-        return False
+        A path naming the same file on disk is returned first, followed by
+        referenced paths sharing the file name (for relative paths from diffs).
+        Each queried path is normalized once per instance.
+        """
+        by_key, by_name = self._path_lookup()
+        normalized = self._query_keys.get(file_path)
+        if normalized is None:
+            normalized = self._query_keys[file_path] = _normalize_path(file_path)
+        key, name = normalized
+        exact = by_key.get(key)
+        same_name = by_name.get(name, [])
+        if exact is None:
+            return same_name
+        return [exact] + [ref_path for ref_path in same_name if ref_path != exact]
+    
+    def references_symbol_at_line(self, file_path: str, line: int) -> SymbolReference | None:
+        """Get the innermost referenced symbol containing the given line, if any."""
+        for ref_path in self._matching_paths(file_path):
+            ref = self._symbol_at_line(ref_path, line)
+            if ref is not None:
+                return ref
+        return None
+    
+    def _referenced_lines(self, file_path: str) -> set[int] | array[int] | None:
+        """Get the referenced lines of the best match for file_path, if any."""
+        for ref_path in self._matching_paths(file_path):
+            return self.referenced_files[ref_path]
+        return None
+    
+    def references_file(self, file_path: str) -> bool:
+        """Check if this endpoint references a file."""
+        return self._referenced_lines(file_path) is not None
     
     def references_lines(self, file_path: str, lines: set[int]) -> set[int]:
         """Get the intersection of referenced lines with given lines."""
-        file_path_resolved = str(Path(file_path).resolve())
-        file_name = Path(file_path).name
-        
-        for ref_path, ref_lines in self.referenced_files.items():
-            ref_resolved = str(Path(ref_path).resolve())
-            ref_name = Path(ref_path).name
-            if (ref_resolved == file_path_resolved or
-                ref_path.endswith(str(file_path)) or
-                file_path.endswith(ref_path) or
-                ref_name == file_name):
-                return ref_lines & lines
-        
-        return set()
+        ref_lines = self._referenced_lines(file_path)
+        if ref_lines is None:
+            return set()
+        if isinstance(ref_lines, array):
+            return _intersect_sorted(ref_lines, lines)
+        return ref_lines & lines
     
     def get_call_stack(self, file_path: str) -> list[CallFrame]:
         """Get the call stack for how the handler reaches a specific file."""
-        file_path_resolved = str(Path(file_path).resolve())
-        file_name = Path(file_path).name
-        
-        for ref_path, stack in self.call_stacks.items():
-            ref_resolved = str(Path(ref_path).resolve())
-            ref_name = Path(ref_path).name
-            if (ref_resolved == file_path_resolved or
-                ref_path.endswith(str(file_path)) or
-                file_path.endswith(ref_path) or
-                ref_name == file_name):
+        for ref_path in self._matching_paths(file_path):
+            stack = self.call_stacks.get(ref_path)
+            if stack:
                 return stack
         
         return []
@@ -157,10 +461,19 @@ class MypyAnalyzer:
     and extract precise file/line information for all references.
     """
     
-    def __init__(self, app_path: Path) -> None:
-        """Initialize the mypy analyzer."""
+    def __init__(self, app_path: Path, incremental: bool = True) -> None:
+        """
+        Initialize the mypy analyzer.
+        
+        Args:
+            app_path: Path to the application package.
+            incremental: Reuse mypy's on-disk cache for modules outside the
+                project (stdlib, typeshed, site-packages) across runs.
+        """
         self.app_path = app_path.resolve()
+        self.incremental = incremental
         self._endpoint_deps: dict[str, EndpointDependencies] = {}
+        self._endpoints_by_path: tuple[dict[PathKey, set[str]], dict[str, set[str]]] | None = None
         self._mypy_available = self._check_mypy_available()
         self._cache_file: Path | None = None
         self._line_progress_callback: LineProgressCallback | None = None
@@ -169,7 +482,14 @@ class MypyAnalyzer:
         self._build_result: Any = None
         self._trees: dict[str, Any] = {}  # module_name -> MypyFile
         self._module_to_path: dict[str, str] = {}
+        self._module_by_path: dict[PathKey, str] | None = None  # path key -> module_name
+        # Module name segments -> nested trie; None keys hold (path, module_name)
+        self._module_trie: dict[str | None, Any] | None = None
+        self._project_modules: set[str] = set()  # modules under the source root
+        self._project_packages: set[str] = set()  # their top-level package names
         self._types_map: dict[Any, Any] = {}  # AST node -> Type
+        self._func_index: dict[str, dict[str, tuple[Any, str] | None]] = {}  # module -> name -> def
+        self._trace_targets: dict[str, TraceTarget | None] = {}  # fullname -> resolved target
     
     @property
     def cache_path(self) -> Path:
@@ -178,6 +498,11 @@ class MypyAnalyzer:
             return self._cache_file
         return self.app_path.parent / ".endpoint_mypy_cache.json"
     
+    @property
+    def build_cache_dir(self) -> Path:
+        """Directory holding mypy's incremental cache, next to the analysis cache."""
+        return self.cache_path.parent / ".endpoint_mypy_build"
+    
     def set_cache_path(self, path: Path) -> None:
         """Set a custom cache file path."""
         self._cache_file = path
@@ -188,9 +513,10 @@ class MypyAnalyzer:
 
     def _check_mypy_available(self) -> bool:
         """Check if mypy is available."""
+        if not _MYPY_NODES_AVAILABLE:
+            return False
         try:
             from mypy.build import build
-            from mypy.nodes import MypyFile
             return True
         except ImportError:
             return False
@@ -201,6 +527,41 @@ class MypyAnalyzer:
             return self.app_path.parent
         return self.app_path
     
+    def _iter_source_files(self) -> Iterator[tuple[str, list[str], str]]:
+        """
+        Yield (directory, package_parts, file_name) for every project source file.
+        
+        Hidden and cache directories are pruned before descending into them
+        (virtualenvs, .git, ...). package_parts are the dotted-name parts of
+        the directory relative to the source root's parent.
+        """
+        source_root = self._get_source_root()
+        package_root = str(source_root.parent)
+        for dir_path, dir_names, file_names in os.walk(source_root):
+            dir_names[:] = [d for d in dir_names if not d.startswith(('.', '__pycache__'))]
+            
+            rel_dir = os.path.relpath(dir_path, package_root)
+            package_parts = rel_dir.split(os.sep) if rel_dir != os.curdir else []
+            for file_name in file_names:
+                if file_name.endswith('.py') and not file_name.startswith('.'):
+                    yield dir_path, package_parts, file_name
+    
+    def source_fingerprint(self) -> str:
+        """
+        Get a digest of the path, modification time and size of every project source file.
+        
+        Changes whenever a project file is edited, added or removed, so it
+        can key results derived from the sources without re-analyzing them.
+        Costs one directory walk and one stat per source file on every call;
+        the stamps recorded by _save_cache cannot stand in for it because
+        they only cover files already referenced by some endpoint.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for dir_path, _, file_name in sorted(self._iter_source_files()):
+            py_file = os.path.join(dir_path, file_name)
+            digest.update(f"{py_file}\0{_file_stamp(py_file)}\n".encode())
+        return digest.hexdigest()
+    
     def _ensure_mypy_built(self) -> None:
         """Ensure mypy has analyzed the project and we have the typed ASTs."""
         if self._trees:
@@ -213,26 +574,35 @@ class MypyAnalyzer:
         from mypy.options import Options
         from mypy.fscache import FileSystemCache
         from mypy.modulefinder import BuildSource
+        from mypy.util import DecodeError, decode_python_encoding
         
         source_root = self._get_source_root()
+        fscache = FileSystemCache()
         
         # Collect all Python files
         sources: list[BuildSource] = []
-        for py_file in source_root.rglob("*.py"):
-            if any(part.startswith(('.', '__pycache__')) for part in py_file.parts):
-                continue
-            
-            try:
-                rel_path = py_file.relative_to(source_root.parent)
-                if rel_path.name == "__init__.py":
-                    module_name = str(rel_path.parent).replace('/', '.').replace('\\', '.')
-                else:
-                    module_name = str(rel_path.with_suffix('')).replace('/', '.').replace('\\', '.')
-            except ValueError:
-                module_name = py_file.stem
+        for dir_path, package_parts, file_name in self._iter_source_files():
+            if file_name == "__init__.py":
+                module_name = '.'.join(package_parts)
+            else:
+                module_name = '.'.join([*package_parts, file_name[:-3]])
+            module_name = sys.intern(module_name)
             
-            sources.append(BuildSource(path=str(py_file), module=module_name))
-            self._module_to_path[module_name] = str(py_file)
+            py_file = os.path.join(dir_path, file_name)
+            # Handing mypy the source text makes it skip its cache for
+            # project modules, so they are always fully analyzed and keep
+            # their function bodies and types; everything they import
+            # can still be loaded from the incremental cache
+            text = None
+            if self.incremental:
+                try:
+                    text = decode_python_encoding(fscache.read(py_file))
+                except (OSError, UnicodeDecodeError, DecodeError) as e:
+                    raise MypyAnalyzerError(f"Cannot read {py_file}: {e}") from e
+            sources.append(BuildSource(path=py_file, module=module_name, text=text))
+            self._module_to_path[module_name] = py_file
+            self._project_modules.add(module_name)
+            self._project_packages.add(module_name.partition('.')[0])
         
         # Configure mypy for full analysis with AST retention
         options = Options()
@@ -242,7 +612,8 @@ class MypyAnalyzer:
         options.namespace_packages = True
         options.explicit_package_bases = True
         options.preserve_asts = True
-        options.incremental = False
+        options.incremental = self.incremental
+        options.cache_dir = str(self.build_cache_dir) if self.incremental else os.devnull
         options.check_untyped_defs = True
         options.export_types = True  # Critical for type information!
         
@@ -251,7 +622,6 @@ class MypyAnalyzer:
             sys.path.insert(0, str(source_root.parent))
         
         try:
-            fscache = FileSystemCache()
             self._build_result = mypy_build(sources=sources, options=options, fscache=fscache)
             
             # Store the types map
@@ -272,98 +642,240 @@ class MypyAnalyzer:
         """
         Find a function/method definition in a mypy AST.
         
-        Returns (func_node, qualified_name) or None.
+        Returns (func_node, qualified_name) or None. Each tree's definitions
+        are indexed by name on first lookup.
+        """
+        index = self._func_index.get(tree.fullname)
+        if index is None:
+            index = self._func_index[tree.fullname] = self._build_func_index(tree)
+        return index.get(func_name)
+    
+    def _build_func_index(self, tree: Any) -> dict[str, tuple[Any, str] | None]:
         """
-        from mypy.nodes import FuncDef, Decorator, ClassDef, OverloadedFuncDef
+        Index the function/method definitions of a mypy AST by name.
         
+        When a name is defined more than once, the first definition in source
+        order wins.
+        """
+        index: dict[str, tuple[Any, str] | None] = {}
         for defn in tree.defs:
-            if isinstance(defn, FuncDef) and defn.name == func_name:
-                return defn, defn.name
-            if isinstance(defn, Decorator) and defn.func.name == func_name:
-                return defn.func, defn.func.name
-            if isinstance(defn, OverloadedFuncDef) and defn.name == func_name:
+            if isinstance(defn, FuncDef):
+                index.setdefault(defn.name, (defn, defn.name))
+            elif isinstance(defn, Decorator):
+                index.setdefault(defn.func.name, (defn.func, defn.func.name))
+            elif isinstance(defn, OverloadedFuncDef):
                 # For overloaded functions, get the first implementation
-                if defn.items:
-                    first = defn.items[0]
-                    if isinstance(first, Decorator):
-                        return first.func, first.func.name
-                return None
-            if isinstance(defn, ClassDef):
-                # Search methods in class
+                first = defn.items[0] if defn.items else None
+                if isinstance(first, Decorator):
+                    index.setdefault(defn.name, (first.func, first.func.name))
+                else:
+                    index.setdefault(defn.name, None)
+            elif isinstance(defn, ClassDef):
+                # Index methods in class
                 for item in defn.defs.body:
-                    if isinstance(item, FuncDef) and item.name == func_name:
-                        return item, f"{defn.name}.{item.name}"
-                    if isinstance(item, Decorator) and item.func.name == func_name:
-                        return item.func, f"{defn.name}.{item.func.name}"
-        return None
+                    if isinstance(item, FuncDef):
+                        index.setdefault(item.name, (item, f"{defn.name}.{item.name}"))
+                    elif isinstance(item, Decorator):
+                        index.setdefault(
+                            item.func.name, (item.func, f"{defn.name}.{item.func.name}")
+                        )
+        return index
     
     def _get_func_lines(self, func_node: Any) -> tuple[int, int]:
         """Get the start and end lines of a function node."""
+        # Every mypy node defines end_line (None when unknown), so no getattr
         start = func_node.line
-        end = getattr(func_node, 'end_line', None)
+        end = func_node.end_line
         if end is None:
             end = start + 50  # Estimate
         return start, end
     
+    def _build_module_trie(self) -> dict[str | None, Any]:
+        """
+        Build a trie of module names keyed by dotted segment.
+        
+        Each node maps the next segment to a child node; a node that ends a
+        module name also holds (file_path, module_name) under the None key.
+        """
+        trie: dict[str | None, Any] = {}
+        for module_name, module_path in self._module_to_path.items():
+            node = trie
+            for segment in module_name.split('.'):
+                node = node.setdefault(segment, {})
+            node[None] = module_path, module_name
+        return trie
+    
     def _resolve_fullname_to_file(self, fullname: str) -> tuple[str, str] | None:
         """
         Try to resolve a fullname to (file_path, module_name).
         
-        Returns None if not found in our project.
+        The longest module name that prefixes fullname wins. It is found by
+        walking the module trie one segment at a time instead of joining and
+        looking up every prefix. Returns None if not found in our project.
+        Callers go through the memoized _resolve_trace_target, so each
+        fullname is resolved once.
+        """
+        if self._module_trie is None:
+            self._module_trie = self._build_module_trie()
+        
+        result: tuple[str, str] | None = None
+        node = self._module_trie
+        for segment in fullname.split('.'):
+            child = node.get(segment)
+            if child is None:
+                break
+            node = child
+            result = node.get(None, result)
+        
+        return result
+    
+    def _resolve_trace_target(self, fullname: str) -> TraceTarget | None:
+        """
+        Resolve a referenced fullname to the project definition to trace into.
+        
+        Returns (file_path, module_name, func_node, start_line, end_line), with
+        func_node None and a placeholder range when only the module could be
+        located, or None for names outside the project. Memoized because
+        every endpoint calling a shared helper resolves the same fullname.
         """
+        if fullname in self._trace_targets:
+            return self._trace_targets[fullname]
+        
+        target: TraceTarget | None = None
+        # Stdlib and third-party names can never resolve into the project
+        if fullname.partition('.')[0] in self._project_packages:
+            result = self._resolve_fullname_to_file(fullname)
+            # Skip if outside our project trees
+            if result and result[1] in self._project_modules and result[1] in self._trees:
+                target = self._locate_trace_target(fullname, *result)
+        
+        self._trace_targets[fullname] = target
+        return target
+    
+    def _locate_trace_target(
+        self,
+        fullname: str,
+        target_path: str,
+        target_module: str,
+    ) -> TraceTarget:
+        """Find the definition named by fullname inside its resolved module."""
+        # The symbol name is everything after the module name
         parts = fullname.split('.')
+        if fullname.startswith(target_module):
+            symbol_name = (
+                fullname[len(target_module) + 1:] if len(fullname) > len(target_module) else ""
+            )
+        else:
+            symbol_name = parts[-1]
         
-        # Try progressively shorter module paths
-        for i in range(len(parts), 0, -1):
-            candidate = '.'.join(parts[:i])
-            if candidate in self._module_to_path:
-                return self._module_to_path[candidate], candidate
-            if candidate in self._trees:
-                state = self._build_result.graph.get(candidate)
-                if state and state.path:
-                    return state.path, candidate
+        func_name = symbol_name.split('.')[-1] if symbol_name else parts[-1]
+        func_result = self._find_func_in_tree(self._trees[target_module], func_name)
+        if not func_result:
+            return target_path, target_module, None, 1, 20
         
-        return None
+        target_func = func_result[0]
+        start, end = self._get_func_lines(target_func)
+        return target_path, target_module, target_func, start, end
     
     def _get_type_from_node(self, node: Any) -> Any:
         """Get the type of an AST node from mypy's type map."""
         return self._types_map.get(node)
     
+    def _find_handler_module(self, handler_path: str) -> str | None:
+        """
+        Find the name of the module whose source file is handler_path.
+        
+        Requires mypy to have been built; the reverse path index is built on
+        first use and kept for the lifetime of the build.
+        """
+        if self._module_by_path is None:
+            index: dict[PathKey, str] = {}
+            for mod_name, mod_path in self._module_to_path.items():
+                index.setdefault(_normalize_path(mod_path)[0], mod_name)
+            self._module_by_path = index
+        
+        return self._module_by_path.get(_normalize_path(handler_path)[0])
+    
     def analyze_endpoint(self, endpoint: Endpoint) -> EndpointDependencies:
         """Analyze a single endpoint using mypy's typed AST."""
-        deps = EndpointDependencies(
-            endpoint_id=endpoint.identifier,
-            methods=[m.value for m in endpoint.methods],
-            path=endpoint.path,
-        )
-        
-        handler = endpoint.handler
-        if not handler.file_path:
-            return deps
+        if not endpoint.handler.file_path:
+            return self._new_dependencies(endpoint)
         
         try:
             self._ensure_mypy_built()
         except MypyAnalyzerError:
-            return deps
+            return self._new_dependencies(endpoint)
         
         # Find the module containing the handler
-        handler_path = str(Path(handler.file_path).resolve())
-        handler_module: str | None = None
+        handler_path = str(Path(endpoint.handler.file_path).resolve())
+        handler_module = self._find_handler_module(handler_path)
         
-        for mod_name, mod_path in self._module_to_path.items():
-            try:
-                if Path(mod_path).resolve() == Path(handler_path).resolve():
-                    handler_module = mod_name
-                    break
-            except Exception:
-                continue
+        return self._analyze_endpoint_in_module(endpoint, handler_path, handler_module)
+    
+    def _store_dependencies(self, deps: EndpointDependencies) -> None:
+        """Record the analyzed dependencies of an endpoint."""
+        deps.freeze()
+        self._endpoint_deps[deps.endpoint_id] = deps
+        self._endpoints_by_path = None
+    
+    def get_endpoints_referencing_file(self, file_path: str) -> set[str]:
+        """
+        Get the IDs of analyzed endpoints that may reference a file.
+        
+        Uses inverted indexes from referenced path key and file name to
+        endpoint IDs, the same two ways EndpointDependencies matches paths, so
+        the result is a superset of the endpoints whose references_file() is
+        true for file_path, including links under a different name.
+        
+        Args:
+            file_path: Path to the file (can be relative or absolute).
+            
+        Returns:
+            Set of candidate endpoint IDs.
+        """
+        if self._endpoints_by_path is None:
+            by_key: dict[PathKey, set[str]] = {}
+            by_name: dict[str, set[str]] = {}
+            for endpoint_id, deps in self._endpoint_deps.items():
+                dep_keys, dep_names = deps._path_lookup()
+                for key in dep_keys:
+                    by_key.setdefault(key, set()).add(endpoint_id)
+                for name in dep_names:
+                    by_name.setdefault(name, set()).add(endpoint_id)
+            self._endpoints_by_path = (by_key, by_name)
+        
+        by_key, by_name = self._endpoints_by_path
+        key, name = _normalize_path(file_path)
+        return by_key.get(key, set()) | by_name.get(name, set())
+    
+    def _new_dependencies(self, endpoint: Endpoint) -> EndpointDependencies:
+        """Create an empty dependency record for an endpoint."""
+        return EndpointDependencies(
+            endpoint_id=endpoint.identifier,
+            methods=[m.value for m in endpoint.methods],
+            path=endpoint.path,
+        )
+    
+    def _analyze_endpoint_in_module(
+        self,
+        endpoint: Endpoint,
+        handler_path: str,
+        handler_module: str | None,
+    ) -> EndpointDependencies:
+        """
+        Analyze an endpoint whose handler module has already been located.
+        
+        Requires mypy to have been built.
+        """
+        deps = self._new_dependencies(endpoint)
+        handler = endpoint.handler
         
         if not handler_module or handler_module not in self._trees:
             # Module not found - add handler file as reference
             start = handler.line_number
             end = handler.end_line_number or start + 50
             deps.add_symbol_reference(handler_path, handler.name, start, end)
-            self._endpoint_deps[endpoint.identifier] = deps
+            self._store_dependencies(deps)
             return deps
         
         tree = self._trees[handler_module]
@@ -374,7 +886,7 @@ class MypyAnalyzer:
             start = handler.line_number
             end = handler.end_line_number or start + 50
             deps.add_symbol_reference(handler_path, handler.name, start, end)
-            self._endpoint_deps[endpoint.identifier] = deps
+            self._store_dependencies(deps)
             return deps
         
         func_node, func_qname = result
@@ -387,7 +899,7 @@ class MypyAnalyzer:
         
         self._trace_references(func_node, deps, handler_path, handler_module, call_stack, visited)
         
-        self._endpoint_deps[endpoint.identifier] = deps
+        self._store_dependencies(deps)
         return deps
     
     def _trace_references(
@@ -404,17 +916,6 @@ class MypyAnalyzer:
         
         Uses mypy's types map to resolve method calls when type info is available.
         """
-        from mypy.nodes import (
-            CallExpr, MemberExpr, NameExpr, RefExpr, FuncDef,
-            Block, ExpressionStmt, AssignmentStmt,
-            ReturnStmt, IfStmt, WhileStmt, ForStmt, WithStmt,
-            TryStmt, RaiseStmt, AssertStmt, AwaitExpr,
-            IndexExpr, OpExpr, ComparisonExpr, UnaryExpr,
-            ConditionalExpr, ListExpr, TupleExpr, DictExpr, SetExpr,
-            GeneratorExpr, ListComprehension, SetComprehension,
-            DictionaryComprehension, LambdaExpr, YieldExpr, YieldFromExpr,
-        )
-        from mypy.types import Instance, CallableType
         
         def resolve_and_trace(fullname: str, call_line: int) -> None:
             """Resolve a fullname to file/line and trace into it."""
@@ -428,56 +929,35 @@ class MypyAnalyzer:
                     current_file, call_line, fullname.split('.')[-1]
                 )
             
-            # Try to find the target file
-            result = self._resolve_fullname_to_file(fullname)
-            if not result:
-                return
-            
-            target_path, target_module = result
-            
-            # Skip if outside our project trees
-            if target_module not in self._trees:
+            target = self._resolve_trace_target(fullname)
+            if target is None:
                 return
             
-            target_tree = self._trees[target_module]
+            target_path, target_module, target_func, start, end = target
+            deps.add_symbol_reference(target_path, fullname, start, end)
             
-            # Extract the symbol name from fullname
-            parts = fullname.split('.')
-            # The symbol name is everything after the module name
-            if fullname.startswith(target_module):
-                symbol_name = fullname[len(target_module) + 1:] if len(fullname) > len(target_module) else ""
-            else:
-                symbol_name = parts[-1]
+            # Record call stack
+            if target_path not in deps.call_stacks:
+                deps.call_stacks[target_path] = list(call_stack)
             
-            # Try to find the function in the target tree
-            func_name = symbol_name.split('.')[-1] if symbol_name else parts[-1]
-            func_result = self._find_func_in_tree(target_tree, func_name)
+            if target_func is None:
+                # Only the module was located; there is no body to trace
+                return
             
-            if func_result:
-                target_func, qname = func_result
-                start, end = self._get_func_lines(target_func)
-                deps.add_symbol_reference(target_path, fullname, start, end)
-                
-                # Record call stack
-                if target_path not in deps.call_stacks:
-                    deps.call_stacks[target_path] = list(call_stack)
-                
-                # Recursively trace into the target function
-                new_frame = CallFrame(target_path, start, fullname)
-                new_stack = call_stack + [new_frame]
-                
+            # Recursively trace into the target function. The frame is pushed
+            # onto the shared stack for the duration of the call rather than
+            # copying the stack per call; call_stacks only keeps snapshots
+            call_stack.append(CallFrame(target_path, start, fullname))
+            try:
                 self._trace_references(
                     target_func, deps, target_path, target_module, 
-                    new_stack, visited
+                    call_stack, visited
                 )
-            else:
-                # Couldn't find specific function, add module reference
-                deps.add_symbol_reference(target_path, fullname, 1, 20)
-                if target_path not in deps.call_stacks:
-                    deps.call_stacks[target_path] = list(call_stack)
+            finally:
+                call_stack.pop()
         
-        def handle_call_expr(call: CallExpr) -> None:
-            """Handle a function/method call expression."""
+        def handle_call_expr(call: CallExpr) -> list[Any]:
+            """Handle a function/method call expression, returning the nodes left to walk."""
             callee = call.callee
             
             if isinstance(callee, NameExpr):
@@ -498,150 +978,69 @@ class MypyAnalyzer:
                     if receiver_type and isinstance(receiver_type, Instance):
                         # We have type info - construct the method fullname
                         class_fullname = receiver_type.type.fullname
-                        method_fullname = f"{class_fullname}.{callee.name}"
+                        method_fullname = sys.intern(f"{class_fullname}.{callee.name}")
                         deps.add_reference(current_file, call.line, method_fullname)
                         resolve_and_trace(method_fullname, call.line)
                     else:
                         # No type info - try to trace the receiver
                         if isinstance(callee.expr, NameExpr) and callee.expr.fullname:
                             # Receiver is a module or class
-                            combined = f"{callee.expr.fullname}.{callee.name}"
+                            combined = sys.intern(f"{callee.expr.fullname}.{callee.name}")
                             deps.add_reference(current_file, call.line, combined)
                             resolve_and_trace(combined, call.line)
             
-            # Walk callee and arguments
-            walk_node(callee)
-            for arg in call.args:
-                walk_node(arg)
+            # Walk callee and arguments. A NameExpr/MemberExpr callee was
+            # already recorded above, so only the receiver still needs a visit
+            if isinstance(callee, MemberExpr):
+                return [callee.expr, *call.args]
+            if isinstance(callee, NameExpr):
+                return call.args
+            return [callee, *call.args]
+        
+        def handle_member_expr(n: MemberExpr) -> tuple[Any, ...]:
+            """Handle an attribute access that is not a call."""
+            if n.fullname:
+                deps.add_reference(current_file, n.line, n.fullname)
+            return (n.expr,)
+        
+        def handle_name_expr(n: NameExpr) -> tuple[Any, ...]:
+            """Handle a bare name reference."""
+            if n.fullname:
+                deps.add_reference(current_file, n.line, n.fullname)
+            return ()
+        
+        # Nodes that record references; every other node type only has its
+        # children walked, via the shared _child_getter table
+        handlers: dict[type, Callable[[Any], Sequence[Any]]] = {
+            CallExpr: handle_call_expr,
+            MemberExpr: handle_member_expr,
+            NameExpr: handle_name_expr,
+        }
+        
+        # Walk the function body depth-first with an explicit stack instead of
+        # recursion. Children are pushed in reverse so nodes are still visited
+        # in source order, which keeps the first call stack recorded per file
+        # the same as a recursive walk would.
+        if not (hasattr(node, 'body') and node.body):
+            return
         
-        def walk_node(n: Any) -> None:
-            """Recursively walk a mypy AST node."""
+        stack: list[Any] = [node.body]
+        while stack:
+            n = stack.pop()
             if n is None:
-                return
-            
-            if isinstance(n, CallExpr):
-                handle_call_expr(n)
-            
-            elif isinstance(n, MemberExpr):
-                if n.fullname:
-                    deps.add_reference(current_file, n.line, n.fullname)
-                walk_node(n.expr)
-            
-            elif isinstance(n, NameExpr):
-                if n.fullname:
-                    deps.add_reference(current_file, n.line, n.fullname)
-            
-            elif isinstance(n, Block):
-                for stmt in n.body:
-                    walk_node(stmt)
-            
-            elif isinstance(n, ExpressionStmt):
-                walk_node(n.expr)
-            
-            elif isinstance(n, AssignmentStmt):
-                for lv in n.lvalues:
-                    walk_node(lv)
-                walk_node(n.rvalue)
-            
-            elif isinstance(n, ReturnStmt):
-                walk_node(n.expr)
-            
-            elif isinstance(n, IfStmt):
-                for expr in n.expr:
-                    walk_node(expr)
-                for body in n.body:
-                    walk_node(body)
-                if n.else_body:
-                    walk_node(n.else_body)
-            
-            elif isinstance(n, WhileStmt):
-                walk_node(n.expr)
-                walk_node(n.body)
-            
-            elif isinstance(n, ForStmt):
-                walk_node(n.expr)
-                walk_node(n.body)
-            
-            elif isinstance(n, WithStmt):
-                for expr in n.expr:
-                    walk_node(expr)
-                walk_node(n.body)
-            
-            elif isinstance(n, TryStmt):
-                walk_node(n.body)
-                for handler in n.handlers:
-                    walk_node(handler)
-                if n.else_body:
-                    walk_node(n.else_body)
-                if n.finally_body:
-                    walk_node(n.finally_body)
-            
-            elif isinstance(n, RaiseStmt):
-                walk_node(n.expr)
-            
-            elif isinstance(n, AssertStmt):
-                walk_node(n.expr)
-            
-            elif isinstance(n, AwaitExpr):
-                walk_node(n.expr)
-            
-            elif isinstance(n, IndexExpr):
-                walk_node(n.base)
-                walk_node(n.index)
-            
-            elif isinstance(n, OpExpr):
-                walk_node(n.left)
-                walk_node(n.right)
-            
-            elif isinstance(n, ComparisonExpr):
-                for op in n.operands:
-                    walk_node(op)
-            
-            elif isinstance(n, UnaryExpr):
-                walk_node(n.expr)
-            
-            elif isinstance(n, ConditionalExpr):
-                # mypy uses cond/if_true/if_false but some versions use different names
-                if hasattr(n, 'cond'):
-                    walk_node(n.cond)
-                if hasattr(n, 'if_true'):
-                    walk_node(n.if_true)
-                elif hasattr(n, 'then'):
-                    walk_node(n.then)
-                if hasattr(n, 'if_false'):
-                    walk_node(n.if_false)
-                elif hasattr(n, 'else_'):
-                    walk_node(n.else_)
-            
-            elif isinstance(n, (ListExpr, TupleExpr, SetExpr)):
-                for item in n.items:
-                    walk_node(item)
-            
-            elif isinstance(n, DictExpr):
-                for key, value in n.items:
-                    walk_node(key)
-                    walk_node(value)
-            
-            elif isinstance(n, (GeneratorExpr, ListComprehension, SetComprehension, DictionaryComprehension)):
-                if hasattr(n, 'left_expr'):
-                    walk_node(n.left_expr)
-                if hasattr(n, 'condlists'):
-                    for conds in n.condlists:
-                        for cond in conds:
-                            walk_node(cond)
-                if hasattr(n, 'sequences'):
-                    for seq in n.sequences:
-                        walk_node(seq)
+                continue
             
-            elif isinstance(n, LambdaExpr):
-                walk_node(n.body)
+            node_type = type(n)
+            handler = handlers.get(node_type)
+            if handler is not None:
+                children = handler(n)
+            else:
+                getter = _child_getter(node_type)
+                if getter is None:
+                    continue
+                children = getter(n)
             
-            elif isinstance(n, (YieldExpr, YieldFromExpr)):
-                walk_node(n.expr)
-        
-        # Start walking from the function body
-        if hasattr(node, 'body') and node.body:
-            walk_node(node.body)
+            stack.extend(reversed(children))
     
     def analyze_endpoints(
         self,
@@ -666,12 +1065,20 @@ class MypyAnalyzer:
         try:
             self._ensure_mypy_built()
         except MypyAnalyzerError:
-            pass
+            return self._endpoint_deps
         
-        # Analyze uncached endpoints
+        # Group uncached endpoints by handler file so each file's module is
+        # located once, however many routes it defines
+        by_file: dict[str, list[Endpoint]] = {}
         for endpoint in endpoints:
-            if endpoint.identifier not in self._endpoint_deps:
-                self.analyze_endpoint(endpoint)
+            if endpoint.identifier not in self._endpoint_deps and endpoint.handler.file_path:
+                by_file.setdefault(str(endpoint.handler.file_path), []).append(endpoint)
+        
+        for file_path, file_endpoints in by_file.items():
+            handler_path = str(Path(file_path).resolve())
+            handler_module = self._find_handler_module(handler_path)
+            for endpoint in file_endpoints:
+                self._analyze_endpoint_in_module(endpoint, handler_path, handler_module)
         
         # Save cache
         if use_cache:
@@ -680,93 +1087,111 @@ class MypyAnalyzer:
         return self._endpoint_deps
     
     def _save_cache(self) -> None:
-        """Save analysis data to cache file."""
-        cache_data: dict[str, Any] = {}
-        for endpoint_id, deps in self._endpoint_deps.items():
-            cache_data[endpoint_id] = {
-                "methods": deps.methods,
-                "path": deps.path,
-                "referenced_files": {
-                    f: list(lines) for f, lines in deps.referenced_files.items()
-                },
-                "referenced_symbols": [
-                    {
-                        "file_path": ref.file_path,
-                        "symbol_name": ref.symbol_name,
-                        "start_line": ref.start_line,
-                        "end_line": ref.end_line,
-                    }
-                    for ref in deps.referenced_symbols
-                ],
-                "call_stacks": {
-                    f: [
-                        {
-                            "file_path": frame.file_path,
-                            "line_number": frame.line_number,
-                            "function_name": frame.function_name,
-                            "code_context": frame.code_context,
-                        }
-                        for frame in frames
-                    ]
-                    for f, frames in deps.call_stacks.items()
-                },
-            }
+        """
+        Save analysis data to cache file.
+        
+        The file is JSON Lines: a header line holding the format version and
+        the stamp of every referenced file, then one [endpoint_id, entry]
+        line per endpoint. Entries are serialized and written one at a time,
+        so the whole cache is never held in memory as a single nested
+        structure. Symbol references and call frames are stored as
+        positional rows in field order.
+        """
+        stamps: dict[str, list[int] | None] = {}
+        for deps in self._endpoint_deps.values():
+            for file_path in deps.referenced_files:
+                if file_path not in stamps:
+                    stamps[file_path] = _file_stamp(file_path)
         
         try:
-            self.cache_path.write_text(
-                json.dumps(cache_data, indent=2),
-                encoding="utf-8",
-            )
+            with self.cache_path.open("wb") as f:
+                f.write(_dumps_line({"version": CACHE_FORMAT_VERSION, "files": stamps}))
+                for endpoint_id, deps in self._endpoint_deps.items():
+                    entry = {
+                        "methods": deps.methods,
+                        "path": deps.path,
+                        "referenced_files": {
+                            file: _encode_line_runs(lines)
+                            for file, lines in deps.referenced_files.items()
+                        },
+                        "referenced_symbols": [
+                            [ref.file_path, ref.symbol_name, ref.start_line, ref.end_line]
+                            for ref in deps.referenced_symbols
+                        ],
+                        "call_stacks": {
+                            file: [
+                                [
+                                    frame.file_path,
+                                    frame.line_number,
+                                    frame.function_name,
+                                    frame.code_context,
+                                ]
+                                for frame in frames
+                            ]
+                            for file, frames in deps.call_stacks.items()
+                        },
+                    }
+                    f.write(_dumps_line([endpoint_id, entry]))
         except Exception:
             pass
     
     def _load_cache(self) -> None:
-        """Load analysis data from cache file."""
+        """
+        Load analysis data from cache file.
+        
+        Endpoints referencing a file whose modification time or size has
+        changed since the cache was written are skipped, so only they are
+        re-analyzed while the rest of the cache is reused.
+        """
+        loads = orjson.loads if orjson is not None else json.loads
+        # Paths and names repeat across rows and endpoints; share one copy
+        intern = sys.intern
         try:
-            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
-            
-            for endpoint_id, deps_data in data.items():
-                call_stacks: dict[str, list[CallFrame]] = {}
-                for f, frames_data in deps_data.get("call_stacks", {}).items():
-                    call_stacks[f] = [
-                        CallFrame(
-                            file_path=frame["file_path"],
-                            line_number=frame["line_number"],
-                            function_name=frame["function_name"],
-                            code_context=frame.get("code_context", ""),
-                        )
-                        for frame in frames_data
-                    ]
-                
-                symbol_refs: list[SymbolReference] = []
-                for ref_data in deps_data.get("referenced_symbols", []):
-                    if isinstance(ref_data, dict):
-                        symbol_refs.append(SymbolReference(
-                            file_path=ref_data["file_path"],
-                            symbol_name=ref_data["symbol_name"],
-                            start_line=ref_data["start_line"],
-                            end_line=ref_data["end_line"],
-                        ))
+            with self.cache_path.open("rb") as f:
+                header = loads(f.readline())
+                if not isinstance(header, dict) or header.get("version") != CACHE_FORMAT_VERSION:
+                    return
                 
-                self._endpoint_deps[endpoint_id] = EndpointDependencies(
-                    endpoint_id=endpoint_id,
-                    methods=deps_data["methods"],
-                    path=deps_data["path"],
-                    referenced_files={
-                        f: set(lines)
-                        for f, lines in deps_data["referenced_files"].items()
-                    },
-                    referenced_symbols=symbol_refs,
-                    call_stacks=call_stacks,
-                )
+                stale = {
+                    file_path for file_path, stamp in header["files"].items()
+                    if _file_stamp(file_path) != stamp
+                }
+                for line in f:
+                    endpoint_id, deps_data = loads(line)
+                    if stale and not stale.isdisjoint(deps_data["referenced_files"]):
+                        continue
+                    # Decoded line arrays are already sorted, so these come back frozen
+                    self._endpoint_deps[endpoint_id] = EndpointDependencies(
+                        endpoint_id=endpoint_id,
+                        methods=deps_data["methods"],
+                        path=deps_data["path"],
+                        referenced_files={
+                            file: _decode_line_runs(runs)
+                            for file, runs in deps_data["referenced_files"].items()
+                        },
+                        referenced_symbols=[
+                            SymbolReference(intern(file), intern(name), start, end)
+                            for file, name, start, end in deps_data["referenced_symbols"]
+                        ],
+                        call_stacks={
+                            file: [
+                                CallFrame(intern(frame_file), line, intern(name), context)
+                                for frame_file, line, name, context in rows
+                            ]
+                            for file, rows in deps_data["call_stacks"].items()
+                        },
+                    )
         except Exception:
             pass
+        self._endpoints_by_path = None
     
     def clear_cache(self) -> None:
-        """Clear the analysis cache."""
+        """Clear the analysis cache and mypy's incremental cache."""
         if self.cache_path.exists():
             self.cache_path.unlink()
+        shutil.rmtree(self.build_cache_dir, ignore_errors=True)
         self._endpoint_deps.clear()
+        self._endpoints_by_path = None
     
     def get_endpoint_dependencies(
         self,
@@ -5,18 +5,33 @@ This module provides the CLI using Click framework for argument parsing
 and orchestrates the analysis pipeline.
 """
 
+import functools
+import os
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import click
-from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn, TimeElapsedColumn, TimeRemainingColumn
 
 from fastapi_endpoint_detector import __version__
-from fastapi_endpoint_detector.config import Config, load_config
 
-console = Console()
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from fastapi_endpoint_detector.config import Config
+
+
+@functools.cache
+def _console() -> "Console":
+    """
+    Get the shared Rich console, creating it on first use.
+    
+    Rich and the configuration models are imported lazily so that
+    `--help` and `--version` do not pay for them.
+    """
+    from rich.console import Console
+    
+    return Console()
 
 
 @click.group()
@@ -30,8 +45,10 @@ console = Console()
 @click.pass_context
 def cli(ctx: click.Context, config: Optional[Path]) -> None:
     """FastAPI Endpoint Change Detector - Identify affected endpoints from code changes."""
+    from fastapi_endpoint_detector.config import load_config
+    
     ctx.ensure_object(dict)
-    ctx.obj["config"] = load_config(config) if config else Config()
+    ctx.obj["config"] = load_config(config)
 
 
 @cli.command()
@@ -98,10 +115,21 @@ def analyze(
     clear_cache: bool,
 ) -> None:
     """Analyze code changes and identify affected FastAPI endpoints."""
+    from rich.progress import (
+        BarColumn,
+        Progress,
+        SpinnerColumn,
+        TaskProgressColumn,
+        TextColumn,
+        TimeElapsedColumn,
+        TimeRemainingColumn,
+    )
+    
     from fastapi_endpoint_detector.analyzer.change_mapper import ChangeMapper
     from fastapi_endpoint_detector.output.formatters import get_formatter
     
     config: Config = ctx.obj["config"]
+    console = _console()
     
     if verbose:
         console.print(f"[blue]Analyzing FastAPI application at:[/blue] {app}")
@@ -127,7 +155,7 @@ def analyze(
             mapper.clear_cache()
         
         # Track current line being analyzed
-        current_line_info = {"text": ""}
+        line_info = ""
         
         # Create progress bar
         with Progress(
@@ -148,15 +176,15 @@ def analyze(
                     task, 
                     completed=current, 
                     description=description,
-                    line_info=current_line_info["text"],
+                    line_info=line_info,
                 )
             
             def line_progress(file_path: str, line_num: int, symbol: str) -> None:
                 """Update the current line being analyzed."""
-                from pathlib import Path
-                filename = Path(file_path).name
-                current_line_info["text"] = f"→ {filename}:{line_num} ({symbol})"
-                progress.update(task, line_info=current_line_info["text"])
+                nonlocal line_info
+                filename = os.path.basename(file_path)
+                line_info = f"→ {filename}:{line_num} ({symbol})"
+                progress.update(task, line_info=line_info)
             
             # Set line progress callback on mypy analyzer
             # Note: This just initializes the analyzer without running analysis
@@ -224,6 +252,8 @@ def list_endpoints(
     from fastapi_endpoint_detector.parser.fastapi_extractor import FastAPIExtractor
     from fastapi_endpoint_detector.output.formatters import get_formatter
     
+    console = _console()
+    
     try:
         extractor = FastAPIExtractor(app_path=app, app_variable=app_var)
         endpoints = extractor.extract_endpoints()
@@ -8,7 +8,6 @@ sensible defaults for all configuration options.
 from pathlib import Path
 from typing import Optional
 
-import yaml
 from pydantic import BaseModel, Field
 
 
@@ -31,6 +30,11 @@ class ParserConfig(BaseModel):
         default=10,
         description="Maximum depth for dependency traversal.",
     )
+    
+    class Config:
+        """Pydantic model configuration."""
+        
+        frozen = True
 
 
 class AnalysisConfig(BaseModel):
@@ -50,6 +54,11 @@ class AnalysisConfig(BaseModel):
         default=False,
         description="Include test endpoints in analysis.",
     )
+    
+    class Config:
+        """Pydantic model configuration."""
+        
+        frozen = True
 
 
 class OutputConfig(BaseModel):
@@ -71,6 +80,11 @@ class OutputConfig(BaseModel):
         default=False,
         description="Enable verbose output.",
     )
+    
+    class Config:
+        """Pydantic model configuration."""
+        
+        frozen = True
 
 
 class IntegrationConfig(BaseModel):
@@ -84,6 +98,11 @@ class IntegrationConfig(BaseModel):
         default=None,
         description="Path to mypy configuration file.",
     )
+    
+    class Config:
+        """Pydantic model configuration."""
+        
+        frozen = True
 
 
 class Config(BaseModel):
@@ -98,6 +117,11 @@ class Config(BaseModel):
         """Pydantic model configuration."""
         
         extra = "forbid"
+        frozen = True
+
+
+# Configs are frozen, so one default instance can be shared by every caller
+DEFAULT_CONFIG = Config()
 
 
 def load_config(config_path: Optional[Path] = None) -> Config:
@@ -105,7 +129,8 @@ def load_config(config_path: Optional[Path] = None) -> Config:
     Load configuration from a YAML file.
     
     Args:
-        config_path: Path to the configuration file. If None, returns defaults.
+        config_path: Path to the configuration file. If None, returns the
+            shared DEFAULT_CONFIG instance.
         
     Returns:
         Config object with loaded or default values.
@@ -115,14 +140,18 @@ def load_config(config_path: Optional[Path] = None) -> Config:
         ValueError: If the config file is invalid.
     """
     if config_path is None:
-        return Config()
+        return DEFAULT_CONFIG
+    
+    # Imported here so commands run without a config file never load PyYAML
+    import yaml
     
     if not config_path.exists():
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
     
+    # libyaml's C loader when PyYAML was built with it, same safe semantics
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
     try:
-        with open(config_path, encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
+        data = yaml.load(config_path.read_bytes(), Loader=loader) or {}
         return Config(**data)
     except yaml.YAMLError as e:
         raise ValueError(f"Invalid YAML in configuration file: {e}") from e
@@ -130,6 +159,9 @@ def load_config(config_path: Optional[Path] = None) -> Config:
         raise ValueError(f"Failed to load configuration: {e}") from e
 
 
+CONFIG_FILE_NAMES = (".endpoint-detector.yaml", ".endpoint-detector.yml")
+
+
 def find_config_file(start_path: Path) -> Optional[Path]:
     """
     Search for a configuration file starting from the given path.
@@ -143,11 +175,9 @@ def find_config_file(start_path: Path) -> Optional[Path]:
     Returns:
         Path to the config file if found, None otherwise.
     """
-    config_names = [".endpoint-detector.yaml", ".endpoint-detector.yml"]
-    
     current = start_path.resolve()
     while current != current.parent:
-        for name in config_names:
+        for name in CONFIG_FILE_NAMES:
             config_path = current / name
             if config_path.exists():
                 return config_path
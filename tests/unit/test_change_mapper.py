@@ -0,0 +1,195 @@
+"""
+Unit tests for the ChangeMapper.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from fastapi_endpoint_detector.analyzer.change_mapper import (
+    ChangeMapper,
+    _group_consecutive_lines,
+)
+
+
+@pytest.fixture
+def function_based_app() -> Path:
+    """Get the path to the function-based DI example app."""
+    return (
+        Path(__file__).parent.parent.parent
+        / "examples" / "di_patterns" / "function_based" / "main.py"
+    )
+
+
+@pytest.fixture
+def readme_only_diff() -> str:
+    """A diff that touches no Python files."""
+    return """diff --git a/README.md b/README.md
+index 1234567..abcdefg 100644
+--- a/README.md
++++ b/README.md
+@@ -1,3 +1,4 @@
+ # Project
+
+ Some text.
++More text.
+"""
+
+
+class TestChangeMapperPreanalysis:
+    """Tests for skipping mypy pre-analysis."""
+
+    def test_non_python_diff_skips_mypy(
+        self, function_based_app: Path, readme_only_diff: str
+    ) -> None:
+        """Test that a diff without Python changes never builds mypy."""
+        mapper = ChangeMapper(function_based_app, use_cache=False)
+
+        report = mapper.analyze_diff(readme_only_diff)
+
+        assert report.affected_endpoints == []
+        assert report.python_files_changed == 0
+        assert report.total_endpoints > 0
+        assert mapper._mypy_analyzer is None
+
+
+class TestGroupConsecutiveLines:
+    """Tests for grouping changed lines into consecutive runs."""
+
+    def test_groups_runs(self) -> None:
+        """Test that consecutive lines end up in the same group."""
+        assert _group_consecutive_lines([1, 2, 3, 7, 9, 10]) == [[1, 2, 3], [7], [9, 10]]
+
+    def test_single_line(self) -> None:
+        """Test a single line forms a single group."""
+        assert _group_consecutive_lines([42]) == [[42]]
+
+
+class TestChangeMapperReportCache:
+    """Tests for the whole-report cache."""
+
+    @pytest.fixture
+    def app_copy(self, tmp_path: Path, function_based_app: Path) -> Path:
+        """Copy the example app so cache files land in a temporary directory."""
+        app_dir = tmp_path / "app"
+        app_dir.mkdir()
+        app_file = app_dir / "main.py"
+        app_file.write_text(function_based_app.read_text(encoding="utf-8"), encoding="utf-8")
+        return app_file
+
+    @pytest.fixture
+    def handler_diff(self, function_based_app: Path) -> str:
+        """A diff that touches a handler in the example app."""
+        diff_path = function_based_app.parent / "change_auth.diff"
+        return diff_path.read_text(encoding="utf-8").replace(
+            "examples/di_patterns/function_based/main.py", "main.py"
+        )
+
+    def test_repeated_diff_uses_cached_report(
+        self, app_copy: Path, handler_diff: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that re-running the same diff skips analysis entirely."""
+        first = ChangeMapper(app_copy).analyze_diff(handler_diff)
+        assert ChangeMapper(app_copy).report_cache_path.exists()
+
+        mapper = ChangeMapper(app_copy)
+
+        def fail(*args: object, **kwargs: object) -> None:
+            raise AssertionError("analysis should not run on a cache hit")
+
+        monkeypatch.setattr(mapper, "_preanalyze_mypy", fail)
+        second = mapper.analyze_diff(handler_diff)
+
+        assert [ae.endpoint.identifier for ae in second.affected_endpoints] == [
+            ae.endpoint.identifier for ae in first.affected_endpoints
+        ]
+
+    def test_source_edit_invalidates_cached_report(self, tmp_path: Path) -> None:
+        """Test that editing a handler body without moving its lines skips the cached report."""
+        app_dir = tmp_path / "app"
+        app_dir.mkdir()
+        app_file = app_dir / "main.py"
+        source = '''from fastapi import FastAPI
+
+app = FastAPI()
+
+
+def helper():
+    return 1
+
+
+def other():
+    return 2
+
+
+@app.get("/a")
+def read_a():
+    return helper()
+'''
+        app_file.write_text(source, encoding="utf-8")
+        other_diff = """diff --git a/main.py b/main.py
+--- a/main.py
++++ b/main.py
+@@ -10,2 +10,2 @@ def helper():
+ def other():
+-    return 2
++    return 3
+"""
+
+        first = ChangeMapper(app_file).analyze_diff(other_diff)
+        assert [ae.endpoint.identifier for ae in first.affected_endpoints] == []
+
+        app_file.write_text(source.replace("return helper()", "return other()"), encoding="utf-8")
+        stat = app_file.stat()
+        os.utime(app_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        second = ChangeMapper(app_file).analyze_diff(other_diff)
+        assert [ae.endpoint.identifier for ae in second.affected_endpoints] == ["GET /a"]
+
+    def test_key_covers_version_and_working_directory(
+        self, app_copy: Path, handler_diff: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that upgrades and a different working directory change the report key."""
+        mapper = ChangeMapper(app_copy)
+        key = mapper._report_cache_key(handler_diff)
+
+        monkeypatch.setattr(
+            "fastapi_endpoint_detector.analyzer.change_mapper.__version__", "0.0.0.dev0"
+        )
+        assert mapper._report_cache_key(handler_diff) != key
+        monkeypatch.undo()
+        assert mapper._report_cache_key(handler_diff) == key
+
+        monkeypatch.chdir(tmp_path)
+        assert mapper._report_cache_key(handler_diff) != key
+
+    def test_no_cache_does_not_write_report(self, app_copy: Path, handler_diff: str) -> None:
+        """Test that use_cache=False leaves no report cache behind."""
+        mapper = ChangeMapper(app_copy, use_cache=False)
+        mapper.analyze_diff(handler_diff)
+        assert not mapper.report_cache_path.exists()
+
+
+class TestChangeMapperReadLines:
+    """Tests for reading changed source files."""
+
+    def test_read_lines_reuses_and_refreshes(self, tmp_path: Path) -> None:
+        """Test that file lines are cached until the file changes."""
+        source = tmp_path / "module.py"
+        source.write_text("a = 1\n", encoding="utf-8")
+        mapper = ChangeMapper(tmp_path)
+
+        first = mapper._read_lines(str(source))
+        assert first == ["a = 1\n"]
+        assert mapper._read_lines(str(source)) is first
+
+        source.write_text("a = 1\nb = 2\n", encoding="utf-8")
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert mapper._read_lines(str(source)) == ["a = 1\n", "b = 2\n"]
+
+    def test_read_lines_missing_file(self, tmp_path: Path) -> None:
+        """Test that a missing file yields no lines."""
+        mapper = ChangeMapper(tmp_path)
+        assert mapper._read_lines(str(tmp_path / "missing.py")) == []
@@ -0,0 +1,88 @@
+"""
+Unit tests for configuration loading.
+"""
+
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from fastapi_endpoint_detector.config import (
+    DEFAULT_CONFIG,
+    Config,
+    find_config_file,
+    load_config,
+)
+
+
+class TestLoadConfig:
+    """Tests for load_config."""
+
+    def test_defaults_without_path(self) -> None:
+        """Test that no path yields the shared default configuration."""
+        assert load_config(None) is DEFAULT_CONFIG
+        assert Config() == DEFAULT_CONFIG
+
+    def test_config_is_frozen(self) -> None:
+        """Test that configuration objects cannot be modified."""
+        with pytest.raises(ValidationError):
+            DEFAULT_CONFIG.analysis.confidence_threshold = 0.9  # type: ignore[misc]
+
+    def test_load_yaml(self, tmp_path: Path) -> None:
+        """Test loading values from a YAML file."""
+        config_file = tmp_path / ".endpoint-detector.yaml"
+        config_file.write_text(
+            "analysis:\n  confidence_threshold: 0.8\noutput:\n  colorize: false\n",
+            encoding="utf-8",
+        )
+
+        config = load_config(config_file)
+
+        assert config.analysis.confidence_threshold == 0.8
+        assert config.output.colorize is False
+        assert config.parser == Config().parser
+
+    def test_empty_file_gives_defaults(self, tmp_path: Path) -> None:
+        """Test that an empty file falls back to defaults."""
+        config_file = tmp_path / ".endpoint-detector.yaml"
+        config_file.write_text("", encoding="utf-8")
+        assert load_config(config_file) == Config()
+
+    def test_invalid_yaml(self, tmp_path: Path) -> None:
+        """Test that malformed YAML raises ValueError."""
+        config_file = tmp_path / ".endpoint-detector.yaml"
+        config_file.write_text("analysis: [unclosed\n", encoding="utf-8")
+        with pytest.raises(ValueError, match="Invalid YAML"):
+            load_config(config_file)
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        """Test that a missing file raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            load_config(tmp_path / "missing.yaml")
+
+
+class TestFindConfigFile:
+    """Tests for find_config_file."""
+
+    def test_finds_file_in_parent(self, tmp_path: Path) -> None:
+        """Test that the search walks up to parent directories."""
+        config_file = tmp_path / ".endpoint-detector.yml"
+        config_file.write_text("", encoding="utf-8")
+        nested = tmp_path / "app" / "routers"
+        nested.mkdir(parents=True)
+
+        assert find_config_file(nested) == config_file.resolve()
+        assert find_config_file(tmp_path / "app") == config_file.resolve()
+
+    def test_prefers_yaml_extension(self, tmp_path: Path) -> None:
+        """Test that .yaml wins over .yml in the same directory."""
+        (tmp_path / ".endpoint-detector.yml").write_text("", encoding="utf-8")
+        (tmp_path / ".endpoint-detector.yaml").write_text("", encoding="utf-8")
+        assert find_config_file(tmp_path).name == ".endpoint-detector.yaml"
+
+    def test_sees_newly_created_file(self, tmp_path: Path) -> None:
+        """Test that a file created after an earlier search is found."""
+        assert find_config_file(tmp_path) != tmp_path / ".endpoint-detector.yaml"
+        config_file = tmp_path / ".endpoint-detector.yaml"
+        config_file.write_text("", encoding="utf-8")
+        assert find_config_file(tmp_path) == config_file.resolve()
@@ -93,6 +93,20 @@ class TestEndpointRegistry:
         endpoints = registry.get_by_path("/api/users")
         assert len(endpoints) == 2
     
+    def test_contains(
+        self, 
+        sample_endpoint: Endpoint, 
+        sample_endpoint_post: Endpoint,
+    ) -> None:
+        """Test membership compares whole endpoints, not just identifiers."""
+        registry = EndpointRegistry()
+        registry.register(sample_endpoint)
+        
+        same_route = sample_endpoint.model_copy(update={"name": "other"})
+        assert sample_endpoint in registry
+        assert same_route not in registry
+        assert sample_endpoint_post not in registry
+    
     def test_get_by_file(self, sample_endpoint: Endpoint) -> None:
         """Test getting endpoints by file."""
         registry = EndpointRegistry()
@@ -102,6 +116,16 @@ class TestEndpointRegistry:
         assert len(endpoints) == 1
         assert endpoints[0] == sample_endpoint
     
+    def test_get_by_file_relative_diff_path(self, sample_endpoint: Endpoint) -> None:
+        """Test matching relative paths from diffs against registered files."""
+        registry = EndpointRegistry()
+        registry.register(sample_endpoint)
+        
+        assert registry.get_by_file("routers/users.py") == [sample_endpoint]
+        assert registry.get_by_file("./routers/users.py") == [sample_endpoint]
+        assert registry.get_by_file("services/users.py") == []
+        assert registry.get_by_file("routers/items.py") == []
+    
     def test_get_by_module(self, sample_endpoint: Endpoint) -> None:
         """Test getting endpoints by module."""
         registry = EndpointRegistry()
@@ -125,6 +149,20 @@ class TestEndpointRegistry:
         post_endpoints = registry.get_by_method(EndpointMethod.POST)
         assert len(post_endpoints) == 1
     
+    def test_get_by_method_multi_method_endpoint(self, sample_handler: HandlerInfo) -> None:
+        """Test that an endpoint is listed once under each of its methods."""
+        endpoint = Endpoint(
+            path="/api/users",
+            methods=[EndpointMethod.GET, EndpointMethod.HEAD, EndpointMethod.GET],
+            handler=sample_handler,
+        )
+        registry = EndpointRegistry()
+        registry.register(endpoint)
+        
+        assert registry.get_by_method(EndpointMethod.GET) == [endpoint]
+        assert registry.get_by_method(EndpointMethod.HEAD) == [endpoint]
+        assert registry.get_by_method(EndpointMethod.POST) == []
+    
     def test_get_by_tag(self, sample_endpoint: Endpoint) -> None:
         """Test getting endpoints by tag."""
         registry = EndpointRegistry()
@@ -162,6 +200,19 @@ class TestEndpointRegistry:
         )
         assert len(endpoints) == 1
         assert endpoints[0].handler.name == "create_user"
+        
+        # Line range spanning both endpoints, in registration order
+        endpoints = registry.get_by_line_range(
+            Path("/app/routers/users.py"), 
+            start_line=20, 
+            end_line=35,
+        )
+        assert [e.handler.name for e in endpoints] == ["get_users", "create_user"]
+        
+        # Line range between the two handlers
+        assert registry.get_by_line_range(
+            Path("/app/routers/users.py"), start_line=26, end_line=29,
+        ) == []
     
     def test_find_endpoints_using_dependency(
         self, 
@@ -193,3 +244,38 @@ class TestEndpointRegistry:
         assert len(registry.files) == 1
         assert len(registry.modules) == 1
         assert len(registry.paths) == 1  # Same path, different methods
+    
+    def test_properties_refresh_after_register(self, sample_endpoint: Endpoint) -> None:
+        """Test that property key sets are reused until a new registration."""
+        registry = EndpointRegistry()
+        registry.register(sample_endpoint)
+        
+        paths = registry.paths
+        assert registry.paths is paths
+        
+        registry.register(Endpoint(
+            path="/api/items",
+            methods=[EndpointMethod.GET],
+            handler=sample_endpoint.handler,
+        ))
+        assert registry.paths == {"/api/users", "/api/items"}
+    
+    def test_iter_with_ids(
+        self, 
+        sample_endpoint: Endpoint, 
+        sample_endpoint_post: Endpoint,
+    ) -> None:
+        """Test iterating endpoints paired with their identifiers."""
+        registry = EndpointRegistry()
+        registry.register(sample_endpoint)
+        
+        assert list(registry.iter_with_ids()) == [
+            (sample_endpoint, sample_endpoint.identifier),
+        ]
+        
+        # Registering again refreshes the cached pairs
+        registry.register(sample_endpoint_post)
+        assert [ep_id for _, ep_id in registry.iter_with_ids()] == [
+            "GET /api/users",
+            "POST /api/users",
+        ]
@@ -7,6 +7,8 @@ These tests verify the mypy-based dependency analysis, including:
 - Line progress callbacks
 """
 
+import os
+import re
 import tempfile
 from pathlib import Path
 from typing import Optional
@@ -15,9 +17,13 @@ import pytest
 
 from fastapi_endpoint_detector.analyzer.mypy_analyzer import (
     MypyAnalyzer,
+    MypyAnalyzerError,
     EndpointDependencies,
     CallFrame,
     LineProgressCallback,
+    SymbolReference,
+    _decode_line_runs,
+    _encode_line_runs,
 )
 from fastapi_endpoint_detector.models.endpoint import Endpoint, EndpointMethod, HandlerInfo
 
@@ -55,6 +61,50 @@ class TestMypyAnalyzerBasic:
         analyzer.set_line_progress_callback(callback)
         assert analyzer._line_progress_callback is callback
 
+    def test_get_endpoints_referencing_file(self, tmp_path: Path) -> None:
+        """Test the file -> endpoints index over analyzed dependencies."""
+        analyzer = MypyAnalyzer(tmp_path)
+        analyzer._store_dependencies(EndpointDependencies(
+            endpoint_id="GET /users",
+            methods=["GET"],
+            path="/users",
+            referenced_files={"/app/services/user_service.py": {1}},
+        ))
+
+        assert analyzer.get_endpoints_referencing_file("services/user_service.py") == {
+            "GET /users",
+        }
+        assert analyzer.get_endpoints_referencing_file("services/item_service.py") == set()
+
+        # Newly stored endpoints show up in later lookups
+        analyzer._store_dependencies(EndpointDependencies(
+            endpoint_id="GET /items",
+            methods=["GET"],
+            path="/items",
+            referenced_files={"/app/services/item_service.py": {1}},
+        ))
+        assert analyzer.get_endpoints_referencing_file("services/item_service.py") == {
+            "GET /items",
+        }
+
+    def test_endpoints_referencing_hard_link(self, tmp_path: Path) -> None:
+        """Test that the candidate index finds references through a differently named link."""
+        source = tmp_path / "service.py"
+        source.write_text("x = 1\n")
+        hardlink = tmp_path / "linked.py"
+        os.link(source, hardlink)
+        analyzer = MypyAnalyzer(tmp_path)
+        deps = EndpointDependencies(
+            endpoint_id="GET /users",
+            methods=["GET"],
+            path="/users",
+            referenced_files={str(source): {1}},
+        )
+        analyzer._store_dependencies(deps)
+
+        assert deps.references_file(str(hardlink)) is True
+        assert analyzer.get_endpoints_referencing_file(str(hardlink)) == {"GET /users"}
+
 
 class TestMypyAnalyzerLoopPrevention:
     """Tests for loop prevention in circular dependencies."""
@@ -314,6 +364,361 @@ def handler():
         assert len(lines_seen) >= 1  # At minimum one line
 
 
+class TestMypyAnalyzerAnalyzeEndpoints:
+    """Tests for analyzing several endpoints at once."""
+
+    @pytest.fixture
+    def router_project(self, tmp_path: Path) -> Path:
+        """Create a package with two handlers in the same file."""
+        package = tmp_path / "app"
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        helpers_py = package / "helpers.py"
+        helpers_py.write_text("""
+def load_item(item_id: int) -> dict:
+    return {"id": item_id}
+""")
+
+        main_py = package / "main.py"
+        main_py.write_text("""
+from app.helpers import load_item
+
+def get_item():
+    return load_item(1)
+
+def list_items():
+    return [1, 2]
+""")
+
+        return package
+
+    def test_endpoints_sharing_a_file(self, router_project: Path) -> None:
+        """Test that every endpoint in a shared handler file is analyzed."""
+        analyzer = MypyAnalyzer(router_project)
+        main_py = router_project / "main.py"
+        endpoints = [
+            Endpoint(
+                path="/items/1",
+                methods=[EndpointMethod.GET],
+                handler=HandlerInfo(
+                    name="get_item", module="main", file_path=main_py, line_number=4,
+                ),
+            ),
+            Endpoint(
+                path="/items",
+                methods=[EndpointMethod.GET],
+                handler=HandlerInfo(
+                    name="list_items", module="main", file_path=main_py, line_number=7,
+                ),
+            ),
+        ]
+
+        results = analyzer.analyze_endpoints(endpoints, use_cache=False)
+
+        assert set(results) == {"GET /items/1", "GET /items"}
+        assert results["GET /items/1"].references_file(str(router_project / "helpers.py"))
+        assert not results["GET /items"].references_file(str(router_project / "helpers.py"))
+
+    def test_nested_call_stacks(self, router_project: Path) -> None:
+        """Test that call stacks record every frame on the way to a file."""
+        (router_project / "repository.py").write_text("""
+def fetch(item_id: int) -> dict:
+    return {"id": item_id}
+""")
+        (router_project / "service.py").write_text("""
+from app.repository import fetch
+
+def load(item_id: int) -> dict:
+    return fetch(item_id)
+""")
+        main_py = router_project / "main.py"
+        main_py.write_text("""
+from app.service import load
+
+def get_item():
+    return load(1)
+""")
+        analyzer = MypyAnalyzer(router_project)
+        endpoint = Endpoint(
+            path="/items/1",
+            methods=[EndpointMethod.GET],
+            handler=HandlerInfo(
+                name="get_item", module="main", file_path=main_py, line_number=4,
+            ),
+        )
+
+        deps = analyzer.analyze_endpoint(endpoint)
+
+        service_stack = deps.get_call_stack(str(router_project / "service.py"))
+        assert [frame.function_name for frame in service_stack] == ["get_item"]
+        repository_stack = deps.get_call_stack(str(router_project / "repository.py"))
+        assert [frame.function_name for frame in repository_stack] == [
+            "get_item", "app.service.load",
+        ]
+
+    def test_calls_inside_conditionals_and_comprehensions(self, router_project: Path) -> None:
+        """Test that calls nested in conditional expressions and comprehensions are traced."""
+        (router_project / "service.py").write_text("""
+def pick_a(x):
+    return x
+
+def pick_b(x):
+    return x
+
+def source():
+    return [1, 2]
+
+def keep(x):
+    return x > 1
+""")
+        main_py = router_project / "views.py"
+        main_py.write_text("""
+from app.service import keep, pick_a, pick_b, source
+
+def handler(flag: bool):
+    value = pick_a(1) if flag else pick_b(2)
+    return [x for x in source() if keep(x)], {x: x for x in source()}, value
+""")
+        analyzer = MypyAnalyzer(router_project)
+        endpoint = Endpoint(
+            path="/items",
+            methods=[EndpointMethod.GET],
+            handler=HandlerInfo(
+                name="handler", module="views", file_path=main_py, line_number=4,
+            ),
+        )
+
+        deps = analyzer.analyze_endpoints([endpoint], use_cache=False)["GET /items"]
+        traced = {ref.symbol_name for ref in deps.referenced_symbols}
+
+        assert {
+            "app.service.pick_a", "app.service.pick_b", "app.service.source", "app.service.keep",
+        } <= traced
+
+    def test_third_party_calls_are_not_traced(self, tmp_path: Path) -> None:
+        """Test that stdlib and third-party callees stay out of the references."""
+        package = tmp_path / "app"
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        main_py = package / "main.py"
+        main_py.write_text("""
+import json
+
+def get_item():
+    return json.dumps({"a": 1})
+""")
+        analyzer = MypyAnalyzer(package)
+        endpoint = Endpoint(
+            path="/items",
+            methods=[EndpointMethod.GET],
+            handler=HandlerInfo(
+                name="get_item", module="main", file_path=main_py, line_number=4,
+            ),
+        )
+
+        results = analyzer.analyze_endpoints([endpoint], use_cache=False)
+
+        assert list(results["GET /items"].referenced_files) == [str(main_py.resolve())]
+
+    def test_hidden_directories_are_not_sources(self, router_project: Path) -> None:
+        """Test that hidden and cache directories are skipped when collecting sources."""
+        for hidden in (".venv", "__pycache__"):
+            (router_project / hidden).mkdir()
+            (router_project / hidden / "junk.py").write_text("x = 1\n")
+        analyzer = MypyAnalyzer(router_project)
+        analyzer._ensure_mypy_built()
+
+        assert {"app", "app.main", "app.helpers"} <= analyzer._project_modules
+        assert not any("junk" in module for module in analyzer._project_modules)
+
+    def test_find_func_in_tree(self, router_project: Path) -> None:
+        """Test function and method lookup through the per-tree name index."""
+        (router_project / "service.py").write_text("""
+class Service:
+    def load(self):
+        return 1
+
+def load():
+    return 2
+
+def helper():
+    return 3
+""")
+        analyzer = MypyAnalyzer(router_project)
+        analyzer._ensure_mypy_built()
+        tree = analyzer._trees["app.service"]
+
+        func_node, qualified_name = analyzer._find_func_in_tree(tree, "load")
+        assert qualified_name == "Service.load"
+        assert func_node.line == 3
+        assert analyzer._find_func_in_tree(tree, "helper")[1] == "helper"
+        assert analyzer._find_func_in_tree(tree, "missing") is None
+
+    def test_find_handler_module(self, router_project: Path) -> None:
+        """Test that handler files are mapped back to their module names."""
+        analyzer = MypyAnalyzer(router_project)
+        analyzer._ensure_mypy_built()
+
+        assert analyzer._find_handler_module(str(router_project / "main.py")) == "app.main"
+        assert analyzer._find_handler_module(str(router_project / "helpers.py")) == "app.helpers"
+        assert analyzer._find_handler_module(str(router_project / "missing.py")) is None
+
+    def test_resolve_fullname_to_file(self, router_project: Path) -> None:
+        """Test that the longest module prefix of a fullname is resolved."""
+        analyzer = MypyAnalyzer(router_project)
+        analyzer._ensure_mypy_built()
+
+        path, module = analyzer._resolve_fullname_to_file("app.helpers.load_item")
+        assert (Path(path).name, module) == ("helpers.py", "app.helpers")
+        path, module = analyzer._resolve_fullname_to_file("app.missing.thing")
+        assert (Path(path).name, module) == ("__init__.py", "app")
+        assert analyzer._resolve_fullname_to_file("nonexistent_pkg.thing") is None
+
+    def test_resolve_trace_target(self, router_project: Path) -> None:
+        """Test that referenced names resolve to project definitions once."""
+        analyzer = MypyAnalyzer(router_project)
+        analyzer._ensure_mypy_built()
+
+        target = analyzer._resolve_trace_target("app.helpers.load_item")
+        assert target is not None
+        target_path, target_module, func_node, start, end = target
+        assert Path(target_path).name == "helpers.py"
+        assert target_module == "app.helpers"
+        assert (start, end) == (func_node.line, func_node.end_line) == (2, 3)
+        assert analyzer._resolve_trace_target("app.helpers.load_item") is target
+
+        # Module-only matches fall back to a placeholder range
+        assert analyzer._resolve_trace_target("app.helpers.missing")[2:] == (None, 1, 20)
+        assert analyzer._resolve_trace_target("os.path.join") is None
+
+
+class TestMypyAnalyzerCache:
+    """Tests for saving and loading the analysis cache."""
+
+    def test_incremental_build_reuses_mypy_cache(self, tmp_path: Path) -> None:
+        """Test that a warm incremental build still yields full project trees."""
+        package = tmp_path / "app"
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        main_py = package / "main.py"
+        main_py.write_text("""
+def helper():
+    return 1
+
+def handler():
+    return helper()
+""")
+        endpoint = Endpoint(
+            path="/items",
+            methods=[EndpointMethod.GET],
+            handler=HandlerInfo(
+                name="handler", module="main", file_path=main_py, line_number=5,
+            ),
+        )
+
+        cold = MypyAnalyzer(package).analyze_endpoints([endpoint], use_cache=False)
+        assert MypyAnalyzer(package).build_cache_dir.is_dir()
+
+        warm_analyzer = MypyAnalyzer(package)
+        warm = warm_analyzer.analyze_endpoints([endpoint], use_cache=False)
+        assert warm["GET /items"].referenced_files == cold["GET /items"].referenced_files
+        assert "app.main.helper" in {ref.symbol_name for ref in warm["GET /items"].referenced_symbols}
+
+        warm_analyzer.clear_cache()
+        assert not warm_analyzer.build_cache_dir.exists()
+
+    def test_non_incremental_build_writes_no_mypy_cache(self, tmp_path: Path) -> None:
+        """Test that incremental=False leaves no mypy cache behind."""
+        package = tmp_path / "app"
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        (package / "main.py").write_text("x = 1\n")
+
+        analyzer = MypyAnalyzer(package, incremental=False)
+        analyzer._ensure_mypy_built()
+
+        assert "app.main" in analyzer._trees
+        assert not analyzer.build_cache_dir.exists()
+
+    def test_undecodable_source_raises_analyzer_error(self, tmp_path: Path) -> None:
+        """Test that a source file with a bad coding cookie fails the build cleanly."""
+        package = tmp_path / "app"
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        (package / "main.py").write_text("# -*- coding: bogus -*-\nx = 1\n")
+
+        analyzer = MypyAnalyzer(package)
+        with pytest.raises(MypyAnalyzerError, match=re.escape("main.py")):
+            analyzer._ensure_mypy_built()
+
+    def test_line_runs_round_trip(self) -> None:
+        """Test run-length encoding of referenced line sets."""
+        lines = {1, 2, 3, 7, 10, 11}
+        runs = _encode_line_runs(lines)
+        assert runs == [1, 3, 7, 1, 10, 2]
+        assert list(_decode_line_runs(runs)) == sorted(lines)
+        assert _encode_line_runs(set()) == []
+
+    def test_save_and_load_round_trip(self, tmp_path: Path) -> None:
+        """Test that cached dependencies survive a save/load cycle."""
+        analyzer = MypyAnalyzer(tmp_path)
+        analyzer.set_cache_path(tmp_path / "cache.json")
+        deps = EndpointDependencies(endpoint_id="GET /test", methods=["GET"], path="/test")
+        deps.add_symbol_reference("/app/main.py", "handler", 5, 9)
+        deps.add_reference("/app/main.py", 20)
+        deps.call_stacks["/app/main.py"] = [CallFrame("/app/main.py", 5, "handler")]
+        analyzer._store_dependencies(deps)
+        analyzer._store_dependencies(
+            EndpointDependencies(endpoint_id="GET /other", methods=["GET"], path="/other")
+        )
+        analyzer._save_cache()
+
+        # A version header followed by one line per endpoint
+        assert len((tmp_path / "cache.json").read_bytes().splitlines()) == 3
+
+        loaded = MypyAnalyzer(tmp_path)
+        loaded.set_cache_path(tmp_path / "cache.json")
+        loaded._load_cache()
+
+        result = loaded.get_endpoint_dependencies("GET /test")
+        assert result is not None
+        assert set(result.referenced_files["/app/main.py"]) == {5, 6, 7, 8, 9, 20}
+        assert result.referenced_symbols[0].symbol_name == "handler"
+        assert result.get_call_stack("/app/main.py")[0].function_name == "handler"
+        assert loaded.get_endpoint_dependencies("GET /other") is not None
+
+    def test_load_skips_endpoints_with_changed_files(self, tmp_path: Path) -> None:
+        """Test that only endpoints referencing an edited file are invalidated."""
+        users_py = tmp_path / "users.py"
+        users_py.write_text("def get_user():\n    return 1\n")
+        items_py = tmp_path / "items.py"
+        items_py.write_text("def get_item():\n    return 1\n")
+        analyzer = MypyAnalyzer(tmp_path)
+        analyzer.set_cache_path(tmp_path / "cache.json")
+        for endpoint_id, file_path in [("GET /users", users_py), ("GET /items", items_py)]:
+            deps = EndpointDependencies(endpoint_id=endpoint_id, methods=["GET"], path="/")
+            deps.add_symbol_reference(str(file_path), "handler", 1, 2)
+            analyzer._store_dependencies(deps)
+        analyzer._save_cache()
+
+        users_py.write_text("def get_user():\n    return 2 + 2\n")
+
+        loaded = MypyAnalyzer(tmp_path)
+        loaded.set_cache_path(tmp_path / "cache.json")
+        loaded._load_cache()
+        assert loaded.get_endpoint_dependencies("GET /users") is None
+        assert loaded.get_endpoint_dependencies("GET /items") is not None
+
+    def test_load_ignores_other_cache_versions(self, tmp_path: Path) -> None:
+        """Test that a cache written in an older layout is ignored."""
+        cache_file = tmp_path / "cache.json"
+        cache_file.write_text('{"GET /test": {"methods": ["GET"], "path": "/test"}}')
+        analyzer = MypyAnalyzer(tmp_path)
+        analyzer.set_cache_path(cache_file)
+        analyzer._load_cache()
+        assert analyzer.get_endpoint_dependencies("GET /test") is None
+
+
 class TestEndpointDependencies:
     """Tests for the EndpointDependencies data class."""
     
@@ -350,6 +755,143 @@ class TestEndpointDependencies:
         assert 20 in lines
         assert 15 not in lines
 
+    def test_frozen_lines(self) -> None:
+        """Test line lookups after freezing, and adding references afterwards."""
+        deps = EndpointDependencies(
+            endpoint_id="GET /test",
+            methods=["GET"],
+            path="/test",
+            referenced_files={"/path/to/file.py": {10, 20, 30}},
+        )
+        deps.freeze()
+
+        assert list(deps.referenced_files["/path/to/file.py"]) == [10, 20, 30]
+        assert deps.references_lines("/path/to/file.py", {5, 10, 25, 30, 99}) == {10, 30}
+        assert deps.references_lines("/path/to/file.py", set(range(15, 100))) == {20, 30}
+
+        deps.add_reference("/path/to/file.py", 25)
+        assert deps.references_lines("/path/to/file.py", {25}) == {25}
+
+    def test_lookups_match_relative_diff_paths(self) -> None:
+        """Test that relative paths from diffs match absolute referenced paths."""
+        deps = EndpointDependencies(
+            endpoint_id="GET /test",
+            methods=["GET"],
+            path="/test",
+        )
+        deps.add_symbol_reference("/app/services/user_service.py", "get_user", 10, 20)
+        deps.call_stacks["/app/services/user_service.py"] = [
+            CallFrame("/app/routers/users.py", 5, "handler"),
+        ]
+
+        assert deps.references_file("services/user_service.py") is True
+        assert deps.references_lines("services/user_service.py", {15, 30}) == {15}
+        assert deps.get_call_stack("services/user_service.py")[0].function_name == "handler"
+        assert deps.get_call_stack("services/other.py") == []
+
+        # Files referenced after the first lookup are picked up too
+        deps.add_reference("/app/models/user.py", 3)
+        assert deps.references_file("models/user.py") is True
+
+    def test_lookups_match_linked_paths(self, tmp_path: Path) -> None:
+        """Test that symlinks and hard links to a referenced file match it."""
+        source = tmp_path / "service.py"
+        source.write_text("x = 1\n")
+        symlink = tmp_path / "symlinked.py"
+        symlink.symlink_to(source)
+        hardlink = tmp_path / "hardlinked.py"
+        os.link(source, hardlink)
+        deps = EndpointDependencies(
+            endpoint_id="GET /test",
+            methods=["GET"],
+            path="/test",
+            referenced_files={str(source): {1}},
+        )
+
+        assert deps.references_file(str(symlink)) is True
+        assert deps.references_lines(str(hardlink), {1, 2}) == {1}
+        assert deps.references_file(str(tmp_path / "missing.py")) is False
+
+    def test_path_keys_are_not_kept_across_instances(self, tmp_path: Path) -> None:
+        """Test that a path queried before its file exists matches links once it does."""
+        source = tmp_path / "service.py"
+        hardlink = tmp_path / "hardlinked.py"
+        stale = EndpointDependencies(
+            endpoint_id="GET /test",
+            methods=["GET"],
+            path="/test",
+            referenced_files={str(source): {1}},
+        )
+        assert stale.references_file(str(hardlink)) is False
+
+        source.write_text("x = 1\n")
+        os.link(source, hardlink)
+        fresh = EndpointDependencies(
+            endpoint_id="GET /test",
+            methods=["GET"],
+            path="/test",
+            referenced_files={str(source): {1}},
+        )
+
+        assert fresh.references_file(str(hardlink)) is True
+
+    def test_symbol_name_at_line(self) -> None:
+        """Test looking up the symbol that contains a line."""
+        deps = EndpointDependencies(
+            endpoint_id="GET /test",
+            methods=["GET"],
+            path="/test",
+        )
+        deps.add_symbol_reference("/path/to/file.py", "outer", 1, 100)
+        deps.add_symbol_reference("/path/to/file.py", "inner", 10, 20)
+        deps.add_symbol_reference("/path/to/other.py", "other", 1, 5)
+
+        assert deps.symbol_name_at_line("/path/to/file.py", 15) == "inner"
+        assert deps.symbol_name_at_line("/path/to/file.py", 50) == "outer"
+        assert deps.symbol_name_at_line("/path/to/file.py", 101) is None
+        assert deps.symbol_name_at_line("/path/to/missing.py", 1) is None
+
+        # Index is rebuilt after new symbols are added
+        deps.add_symbol_reference("/path/to/file.py", "late", 40, 60)
+        assert deps.symbol_name_at_line("/path/to/file.py", 50) == "late"
+
+    def test_symbol_lookup_stops_below_running_max_end(self) -> None:
+        """Test that lines past every earlier symbol's end skip the backward walk."""
+        deps = EndpointDependencies(
+            endpoint_id="GET /test",
+            methods=["GET"],
+            path="/test",
+        )
+        deps.add_symbol_reference("/path/to/file.py", "Service", 1, 30)
+        for start in range(2, 30, 3):
+            deps.add_symbol_reference("/path/to/file.py", f"method_{start}", start, start + 1)
+        deps.add_symbol_reference("/path/to/file.py", "helper", 40, 45)
+
+        assert deps.symbol_name_at_line("/path/to/file.py", 35) is None
+        assert deps.symbol_name_at_line("/path/to/file.py", 3) == "method_2"
+        assert deps.symbol_name_at_line("/path/to/file.py", 4) == "Service"
+        assert deps.symbol_name_at_line("/path/to/file.py", 42) == "helper"
+
+        _, _, max_ends, _ = deps._symbols_by_file["/path/to/file.py"]
+        assert list(max_ends) == [30] * 11 + [45]
+
+    def test_references_symbol_at_line(self) -> None:
+        """Test finding the innermost symbol at a line through path matching."""
+        deps = EndpointDependencies(
+            endpoint_id="GET /test",
+            methods=["GET"],
+            path="/test",
+        )
+        deps.add_symbol_reference("/app/services/user_service.py", "UserService", 1, 50)
+        deps.add_symbol_reference("/app/services/user_service.py", "get_user", 10, 20)
+
+        assert deps.references_symbol_at_line("services/user_service.py", 15) == SymbolReference(
+            "/app/services/user_service.py", "get_user", 10, 20,
+        )
+        assert deps.references_symbol_at_line("services/user_service.py", 30).symbol_name == "UserService"
+        assert deps.references_symbol_at_line("services/user_service.py", 51) is None
+        assert deps.references_symbol_at_line("services/other.py", 15) is None
+
 
 class TestCallFrame:
     """Tests for the CallFrame data class."""